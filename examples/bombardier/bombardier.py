@@ -202,8 +202,10 @@ class GUIrocket(gx.diagnosticGUI):
             coorddict = {'xq':
                          {'x':'xq', 'y':'yq', 'layer':'trajs', 'name':'quarts1', 'style':'kd'}
                          }
-            quarts = Pointset({'coordarray': np.array([[self.points['x'][int(0.25*n)], self.points['x'][int(0.5*n)], self.points['x'][int(0.75*n)]],
-                                           [self.points['y'][int(0.25*n)], self.points['y'][int(0.5*n)], self.points['y'][int(0.75*n)]]]),
+            # each coordinate is extracted from the Pointset once
+            q_ixs = [int(0.25*n), int(0.5*n), int(0.75*n)]
+            quarts = Pointset({'coordarray': np.array([self.points['x'][q_ixs],
+                                                       self.points['y'][q_ixs]]),
                       'coordnames': ['xq', 'yq']})
             self.add_data_points(quarts, coorddict=coorddict)
 
@@ -411,8 +413,7 @@ class GUIrocket(gx.diagnosticGUI):
         if run:
             self.run()
             self.graphics_refresh(cla=False)
-        self.masterWin.canvas.draw()
-        plt.draw()
+        self.masterWin.canvas.draw_idle()
 
     def set(self, pair, ic=None, by_vel=False):
         """Set solution pair (ang, speed) and optional (x,y)
@@ -185,8 +185,7 @@ class ControlSys:
 
     def highlight_eigens(self):
         for i in range(len(self.clus_layers)):
-            for j in range(1, self.d+1):
-                plotter.add_vline(j, figure=None, layer=self.clus_layers[i], subplot='13', style=self.clus_styles[i], name='vline_'+self.clus_layers[i]+str(self.d)+str(j))
+            plotter.add_vline(range(1, self.d+1), figure=None, layer=self.clus_layers[i], subplot='13', style=self.clus_styles[i], name='vlines_'+self.clus_layers[i]+str(self.d))
 
     def get_projection_distance(self, pt_array, fsign=None):
         """
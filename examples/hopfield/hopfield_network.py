@@ -16,15 +16,15 @@ class HopfieldNetwork:
         
         num_neurons         The number of neurons in the network.
         _weights            The network's weight matrix.
+        _weights_version    Counter incremented each time the weight matrix changes.
         _trainers           A dictionary containing the methods available for 
                             training the network.
-        _vec_activation     A vectorized version of the network's activation function.
         """
         self.num_neurons = num_neurons
         self._weights = np.zeros((self.num_neurons, self.num_neurons), dtype=np.int_)
+        self._weights_version = 0
         self._trainers = {"hebbian": self._hebbian, "storkey": self._storkey}
         self._learn_modes = {"synchronous": self._synchronous, "asynchronous": self._asynchronous}
-        self._vec_activation = np.vectorize(self._activation)
         self._train_act = np.vectorize(self._train_activation)
 
     def weights(self):
@@ -41,6 +41,7 @@ class HopfieldNetwork:
         of training has already been completed.
         """
         self._weights = np.zeros((self.num_neurons, self.num_neurons), dtype=np.int_)
+        self._weights_version += 1
 
     def train(self, patterns, method="hebbian", threshold=0, inject = lambda x, y: None):
         """
@@ -91,6 +92,16 @@ class HopfieldNetwork:
         """
         return -0.5 * np.sum(np.multiply(np.outer(state, state), self._weights))
 
+    def energy_batch(self, states):
+        """
+        Returns the energy of each row of "states", a matrix of network states.
+
+        Equivalent to [self.energy(state) for state in states], but computed with
+        a single matrix product.
+        """
+        states = np.asarray(states)
+        return -0.5 * np.sum(np.dot(states, self._weights) * states, axis=1)
+
     def _synchronous(self, patterns, steps=10):
         """
         Updates all network neurons simultaneously during each iteration of the
@@ -118,7 +129,9 @@ class HopfieldNetwork:
         Convergence is guaranteed, but the learning is slower than when neurons are updated
         in synchrony.
         """
-        patterns = np.array(patterns)
+        # the states also accumulate the neurons' fields, so work on a float
+        # copy (int8 states would wrap around once a field exceeds 127)
+        patterns = np.array(patterns, dtype=float)
         if steps:
             for i in range(steps):
                 index = random.randrange(self.num_neurons)
@@ -133,7 +146,8 @@ class HopfieldNetwork:
                 index = random.randrange(self.num_neurons)
                 indicies.add(index)
                 post_learn[:,index] = np.dot(self._weights[index,:], np.transpose(patterns))
-                post_learn = self._vec_activation(post_learn)
+                # in place, so post_learn stays float for the next field
+                post_learn[...] = self._vec_activation(post_learn)
                 inject(post_learn, i)
                 if np.array_equal(patterns, post_learn) and len(indicies) == self.num_neurons:
                     return self._vec_activation(post_learn)
@@ -150,6 +164,16 @@ class HopfieldNetwork:
             return -1
         return 1
 
+    def _vec_activation(self, values, threshold=0):
+        """
+        Applies the network's activation function to every entry of an array of values
+        at once, e.g. to a whole batch of patterns.
+
+        The resulting bipolar states are returned as int8, which is plenty for +/-1
+        (but not for fields: callers accumulating into the states use a wider copy).
+        """
+        return np.where(np.asarray(values) < threshold, np.int8(-1), np.int8(1))
+
     def _train_activation(self, value, threshold=0):
         if value == threshold:
             return value
@@ -157,6 +181,13 @@ class HopfieldNetwork:
             return -1
         return 1
 
+    def _train_act_out(self, weights, out):
+        """
+        Applies self._train_activation (with the default threshold of 0) to every
+        entry of "weights", writing the result into the preallocated array "out".
+        """
+        return np.sign(weights, out=out)
+
     def _hebbian(self, patterns, threshold=0, inject= lambda x, y: None):
         """
         Implements Hebbian learning.
@@ -165,10 +196,12 @@ class HopfieldNetwork:
         for pattern in patterns:
             prev = self._weights.copy()
             self._weights += np.outer(pattern, pattern)
+            self._weights_version += 1
             inject(prev, i)
             i += 1
         np.fill_diagonal(self._weights, 0)
         self._weights = self._weights / len(patterns)
+        self._weights_version += 1
 
     def _storkey(self, patterns):
         """
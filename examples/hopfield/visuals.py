@@ -4,64 +4,14 @@ import numpy as np
 from matplotlib.pyplot import *
 from matplotlib import gridspec
 from sklearn.decomposition import PCA
-from scipy.interpolate import griddata as gd
+from scipy.spatial import cKDTree
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.colors import colorConverter
 import time, warnings
 
 neuron_radius = 1
-
-class VisualNeuron:
-    """
-    Class creates a visual representation of a neuron in a generic Hopfield Network.
-
-    The VisualHopfieldNetwork class presents a collection of visual neurons in a circular
-    arrangement, and thus the VisualNeuron position is initialized with polar coordinates.
-    """
-    def __init__(self, theta, r):
-        """
-        theta   the polar angle of the neuron's position
-        r       the polar radius of the neuron's position
-        """
-        self.theta = theta
-        self.r = r
-        self.x = r * np.cos(theta)
-        self.y = r * np.sin(theta)
-        self.connections = {}
-
-    def __repr__(self):
-        """
-        Defines a string representation for a neuron giving its position in Cartesian coordinates.
-        """
-        return "Visual Neuron at " + str((self.x, self.y))
-
-    def draw(self, axis):
-        """
-        Draws a neuron to the provided Matplotlib axis.
-        """
-        self.body = Circle((self.x, self.y), radius=neuron_radius, fill=False)
-        axis.add_patch(self.body)
-
-    def draw_connection(self, neuron, connection_color, axis):
-        """
-        Draws a connection between two neurons.
-
-        neuron              the terminal neuron of the connection
-        connection_color    the color of the connection line to be drawn
-        axis                the Matplotlib axis to which the connection should be drawn
-        """
-        connection = Line2D((self.x, neuron.x), (self.y, neuron.y), color=connection_color)
-        self.connections.update({ neuron :  connection })
-        neuron.connections.update({ self : connection })
-        axis.add_line(self.connections[neuron])
-
-    def delete_connection(self, neuron):
-        """
-        Delete the connection between self and neuron. The connection will no longer
-        be drawn in the network diagram and will be cleared from memory.
-
-        neuron      the terminal neuron of the connection
-        """
-        network_lines = self.network_diagrm.lines
-        del network_lines[network_lines.index(self.connections[neuron])]
+# RGBA colors of connections with weight -1, 0 and 1, indexed by weight + 1
+connection_colors = colorConverter.to_rgba_array(['red', 'green', 'blue'])
 
 class VisualHopfield(HopfieldNetwork):
     def __init__(self, num_neurons):
@@ -70,13 +20,31 @@ class VisualHopfield(HopfieldNetwork):
         """
         HopfieldNetwork.__init__(self, num_neurons)
         d_theta = (2 * np.pi) / num_neurons
-        self.neurons = [VisualNeuron(i * d_theta, num_neurons) for i in range(num_neurons)]
+        # Cartesian coordinates of every neuron, indexed by neuron number. The neurons
+        # are arranged on a circle of radius num_neurons.
+        thetas = np.arange(num_neurons) * d_theta
+        self.neuron_x = num_neurons * np.cos(thetas)
+        self.neuron_y = num_neurons * np.sin(thetas)
         self.cs_plot = None
+        self._act_cache = (None, None)
+        self._act_buf = None
+        # (row, column) indices of each connection in the upper triangle of the
+        # weight matrix, in the order of the segments in self.connections
+        self._conn_indices = np.triu_indices(num_neurons, k=1)
+        # maps a (row, column) pair of neurons to the index of their connection
+        rows, columns = self._conn_indices
+        self._pair_index = -np.ones((num_neurons, num_neurons), dtype=np.int32)
+        self._pair_index[rows, columns] = np.arange(len(rows))
+        self._pair_index[columns, rows] = self._pair_index[rows, columns]
 
-    def run_visualization(self, training_data, learning_data=None):
+    def run_visualization(self, training_data, learning_data=None, stride=1):
         """
         Runs the Hopfield Network visualization. Trains the network on training_data and
         learns on learning_data.
+
+        stride      Only every stride-th training iteration (and always the last one)
+                    is drawn. Larger strides speed up the visualization of large
+                    training sets.
         """
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
@@ -87,11 +55,15 @@ class VisualHopfield(HopfieldNetwork):
             self._draw_network()
             self._plot_state([-1 for i in range(self.num_neurons)])
             self._plot_weights()
+            self._cache_background()
+            self._inject_stride = stride
+            self._drawn_weights = self._weights.copy()
             print("Training...")
             self._set_mode("Training")
             self.train(training_data, inject=self._train_inject)
             self._normalize_network()
             self._plotenergy()
+            self._cache_background()
             print("Learning...")
             self._set_mode("Learning")
             for state in learning_data:
@@ -106,22 +78,42 @@ class VisualHopfield(HopfieldNetwork):
         iteration           The current iteration count
         delay               The time delay between each iteration. Larger delays
                             slow the rate of visualization and vice versa.
+
+        Connections are highlighted if they changed since the last drawn iteration,
+        which is the one given by prev_weights unless iterations are being skipped
+        (see the stride argument of run_visualization).
         """
+        if iteration % self._inject_stride and iteration != len(self.training_data):
+            return
+        prev_weights, self._drawn_weights = self._drawn_weights, self._weights.copy()
         self.cmap.set_data(self._weights)
         self._update_iter(iteration)
-        new_weights = self._train_act(self.weights())
-        colors = ['green', 'blue', 'red']
-        for ((row, column), value) in np.ndenumerate(new_weights):
-            if self.neurons[row] is self.neurons[column]:
-                continue
-            elif new_weights[row,column] != prev_weights[row,column]:
-                connection = self.neurons[row].connections[self.neurons[column]]
-                setp(connection, linewidth='4')
-                setp(connection, color=colors[new_weights[row,column]])
-            else:
-                connection = self.neurons[row].connections[self.neurons[column]]
-                setp(connection, linewidth='1')
-        pause(delay)
+        new_weights = self._activated_weights()
+        rows, columns = np.nonzero(np.triu(new_weights != prev_weights, k=1))
+        changed = self._pair_index[rows, columns]
+        self._conn_widths[self._highlighted] = 1
+        self._conn_widths[changed] = 4
+        self._conn_colors[changed] = connection_colors[new_weights[rows, columns] + 1]
+        self._highlighted = changed
+        self.connections.set_linewidths(self._conn_widths)
+        self.connections.set_colors(self._conn_colors)
+        self._blit_frame(delay)
+
+    def _activated_weights(self):
+        """
+        Returns the weight matrix passed through the training activation function.
+
+        The result is cached and only recomputed, into the same buffer, once the
+        weights have changed.
+        """
+        version, activated = self._act_cache
+        if version != self._weights_version:
+            weights = self.weights()
+            if self._act_buf is None or self._act_buf.dtype != weights.dtype:
+                self._act_buf = np.empty_like(weights)
+            activated = self._train_act_out(weights, self._act_buf)
+            self._act_cache = (self._weights_version, activated)
+        return activated
 
     def _set_mode(self, mode):
         """
@@ -148,16 +140,79 @@ class VisualHopfield(HopfieldNetwork):
         iteration   The current iteration count.
         delay       The time delay between successive iterations of learning.
         """
-        state = np.array(state)
-        self.state_plot.set_data(state.reshape(5, 5))
+        state = np.asarray(state)
+        # (assignment casts: learn() hands over its float working copy,
+        # whose values are exactly +/-1)
+        self._state_buf[...] = state.reshape(self._state_buf.shape)
+        self.state_plot.set_data(self._state_buf)
         currentenergy = self.energy(state)
-        current_state = self.pca.transform(state)
-        if self.cs_plot:
-            self.cs_plot.remove()
-        self.cs_plot = self.energy_diagram.scatter(current_state[:,0], current_state[:,1], currentenergy,
-                                                s=80, c='b', marker='o')
+        current_state = self._pca_project(state)
+        self.cs_plot._offsets3d = (current_state[:,0], current_state[:,1], np.atleast_1d(currentenergy))
+        self.cs_plot.set_visible(True)
         self._update_iter(iteration)
-        pause(delay)
+        self._blit_frame(delay)
+
+    def _animated_artists(self):
+        """
+        Returns the artists which change between frames of the visualization. These
+        are left out of the cached background and redrawn by _blit_frame().
+        """
+        artists = [self.connections, self.state_plot, self.cmap, self.mode, self.iteration]
+        if self.cs_plot:
+            artists.append(self.cs_plot)
+        return artists
+
+    def _cache_background(self):
+        """
+        Redraws the figure without its animated artists, which triggers _on_draw() to
+        store the result as the background restored by _blit_frame().
+
+        To be called whenever a static part of the figure has been changed.
+        """
+        for artist in self._animated_artists():
+            artist.set_animated(True)
+        if self._draw_cid is None:
+            self._draw_cid = self.network_fig.canvas.mpl_connect('draw_event', self._on_draw)
+        self.network_fig.canvas.draw()
+
+    def _on_draw(self, event):
+        """
+        Callback for the canvas draw_event. Captures the new background (e.g. after
+        the window is resized) and draws the animated artists on top of it.
+        """
+        self._background = self.network_fig.canvas.copy_from_bbox(self.network_fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        """
+        Draws each animated artist to the canvas without compositing the rest of the figure.
+        """
+        for artist in self._animated_artists():
+            if hasattr(artist, 'do_3d_projection'):
+                # 3D artists must be projected onto their axes before being drawn
+                try:
+                    artist.do_3d_projection()
+                except TypeError:
+                    artist.do_3d_projection(self.network_fig.canvas.get_renderer())
+            self.network_fig.draw_artist(artist)
+
+    def _blit_frame(self, delay):
+        """
+        Updates the canvas with the current state of the animated artists only.
+
+        delay       The time delay after the frame has been displayed.
+        """
+        canvas = self.network_fig.canvas
+        if self._background is None or not getattr(canvas, 'supports_blit', True):
+            # no background to restore: request a single full redraw at the next
+            # event loop tick, which _on_draw() completes with the animated artists
+            canvas.draw_idle()
+        else:
+            canvas.restore_region(self._background)
+            self._draw_animated()
+            canvas.blit(self.network_fig.bbox)
+        canvas.flush_events()
+        time.sleep(delay)
 
     def _setup_display(self):
         """
@@ -187,25 +242,30 @@ class VisualHopfield(HopfieldNetwork):
                                           fontsize=14, horizontalalignment='center')
         self.iteration = self.network_fig.text(0.6, 0.95, "Current Iteration: 0",
                                                fontsize=14, horizontalalignment='center')
+        self._background = None
+        self._draw_cid = None
 
     def _draw_network(self):
         """
         Draws the network diagram to the Matplotlib canvas.
         """
-        connections = set()
-        colors = ['green', 'blue', 'red']
-        for (index1, neuron) in enumerate(self.neurons):
-            neuron.draw(self.main_network)
-            connections.add(neuron)
-            for (index2, neuron_two) in enumerate(self.neurons):
-                if neuron_two in connections:
-                    continue
-                else:
-                    connection_color = colors[int(self.weights()[index1, index2])]
-                    neuron.draw_connection(neuron_two, connection_color, self.main_network)
-            self.main_network.autoscale(tight=False)
-
-    def _plotenergy(self, num_samples=25, path_length=20):
+        weights = self._activated_weights()
+        bodies = [Circle(xy, radius=neuron_radius) for xy in zip(self.neuron_x, self.neuron_y)]
+        self.neuron_bodies = PatchCollection(bodies, facecolors='none', edgecolors='k')
+        self.main_network.add_collection(self.neuron_bodies)
+        rows, columns = self._conn_indices
+        starts = np.column_stack((self.neuron_x[rows], self.neuron_y[rows]))
+        ends = np.column_stack((self.neuron_x[columns], self.neuron_y[columns]))
+        segments = np.stack((starts, ends), axis=1)
+        self._conn_widths = np.ones(len(segments))
+        self._conn_colors = connection_colors[(weights[rows, columns] + 1).astype(np.int32)]
+        self._highlighted = np.array([], dtype=np.int_)
+        self.connections = LineCollection(segments, colors=self._conn_colors,
+                                          linewidths=self._conn_widths)
+        self.main_network.add_collection(self.connections)
+        self.main_network.autoscale(tight=False)
+
+    def _plotenergy(self, num_samples=25, path_length=20, wireframe_stride=4):
         """
         Plots the energy function of the network.
 
@@ -213,30 +273,65 @@ class VisualHopfield(HopfieldNetwork):
                             The greater the number of samples, the higher the accuracy of the resultant plot.
         path_length         The number of steps to compute in calculating each sample's path of convergence
                             toward the network's attractors.
+        wireframe_stride    The step between the grid rows and columns drawn in the 3D wireframe. The
+                            contour plot always uses the full grid.
         """
         attractors = self.training_data
-        states = [[np.random.choice([-1, 1]) for i in range(self.num_neurons)] for j in range(num_samples)]
+        states = np.random.choice(np.array([-1, 1], dtype=np.int8), size=(num_samples, self.num_neurons))
         self.pca = PCA(n_components=2)
         self.pca.fit(attractors)
+        # raw PCA basis, so that projections skip the per-call overhead of PCA.transform
+        self._pca_mean = self.pca.mean_
+        self._pca_components = self.pca.components_
         paths = [attractors]
         for i in range(path_length):
             states = self.learn(states, steps=1)
             paths.append(states)
         x = y = np.linspace(-1, 1, 100)
         X,Y = np.meshgrid(x, y)
-        meshpts = np.array([[x, y] for x, y in zip(np.ravel(X), np.ravel(Y))])
-        mesh = self.pca.inverse_transform(meshpts)
-        grid = np.vstack((mesh, np.vstack(paths)))
-        energies = np.array([self.energy(point) for point in grid])
-        grid = self.pca.transform(grid)
+        meshpts = np.column_stack((X.ravel(), Y.ravel()))
+        paths = np.vstack(paths)
+        # the mesh already lies in the PCA plane, so it needs no projection
+        grid = np.vstack((meshpts, self._pca_project(paths)))
+        energies = np.concatenate((self._plane_energy(meshpts), self.energy_batch(paths)))
         gmin, gmax = grid.min(), grid.max()
         xi, yi = np.mgrid[gmin:gmax:100j, gmin:gmax:100j]
-        zi = gd(grid, energies, (xi, yi), method='nearest')
-        self.energy_diagram.plot_wireframe(xi, yi, zi, colors=(0.5, 0.5, 0.5, 0.5), alpha=0.5)# , cmap=cm.coolwarm, linewidth=1)
+        # nearest-neighbour interpolation of the energies onto the regular grid
+        _, nearest = cKDTree(grid).query(np.column_stack((xi.ravel(), yi.ravel())))
+        zi = energies[nearest].reshape(xi.shape)
+        self.energy_diagram.plot_wireframe(xi, yi, zi, rstride=wireframe_stride, cstride=wireframe_stride,
+                                           colors=(0.5, 0.5, 0.5, 0.5), alpha=0.5)# , cmap=cm.coolwarm, linewidth=1)
         self.contour_diagram.contour(xi, yi, zi)
-        grid = self.pca.transform(attractors)
-        z = np.array([self.energy(state) for state in attractors])
+        grid = self._pca_project(attractors)
+        z = self.energy_batch(attractors)
         self.energy_diagram.scatter(grid[:,0], grid[:,1], z, s=80, c='g', marker='o')
+        # marker for the current network state, moved by _learn_inject
+        self.cs_plot = self.energy_diagram.scatter(grid[:1,0], grid[:1,1], z[:1], s=80, c='b',
+                                                   marker='o', animated=True, visible=False)
+
+    def _plane_energy(self, coords):
+        """
+        Returns the energy of the states with the given coordinates in the PCA plane.
+
+        Equivalent to self.energy_batch(np.dot(coords, components) + mean), but the
+        energy quadratic form is first restricted to the plane, so each state costs
+        a 2x2 product rather than one of size num_neurons x num_neurons.
+        """
+        components, mean = self._pca_components, self._pca_mean
+        basis_weights = np.dot(components, self._weights)
+        quadratic = np.dot(basis_weights, components.T)
+        linear = np.dot(basis_weights, mean) + np.dot(mean, self._weights).dot(components.T)
+        constant = np.dot(np.dot(mean, self._weights), mean)
+        return -0.5 * (np.sum(np.dot(coords, quadratic) * coords, axis=1)
+                       + np.dot(coords, linear) + constant)
+
+    def _pca_project(self, states):
+        """
+        Projects the rows of states onto the two principal axes of the training data.
+
+        Equivalent to self.pca.transform(states) for the PCA fitted in _plotenergy.
+        """
+        return np.dot(np.asarray(states) - self._pca_mean, self._pca_components.T)
 
     def _normalize_network(self):
         """
@@ -244,17 +339,25 @@ class VisualHopfield(HopfieldNetwork):
 
         To be called between the training and learning steps of the visualization.
         """
-        for neuron in self.neurons:
-            for line in neuron.connections.values():
-                if line.get_linewidth() != 1:
-                    setp(line, linewidth=1)
+        self._conn_widths[:] = 1
+        self._highlighted = np.array([], dtype=np.int_)
+        self.connections.set_linewidths(self._conn_widths)
 
     def _plot_state(self, state):
         """
         Plot state to the state_diagram.
-        """
-        state = np.array(state)
-        self.state_plot = self.state_diagram.imshow(state.reshape(5, 5),
+
+        The state is drawn as a square image, so the number of neurons must be a
+        perfect square.
+        """
+        side = int(round(np.sqrt(self.num_neurons)))
+        if side * side != self.num_neurons:
+            raise ValueError("Cannot display the state of %d neurons as a square image"
+                             % self.num_neurons)
+        # reused by _learn_inject for every displayed state
+        self._state_buf = np.empty((side, side), dtype=np.int8)
+        self._state_buf[...] = np.reshape(state, (side, side))
+        self.state_plot = self.state_diagram.imshow(self._state_buf,
                                                     cmap=cm.binary,
                                                     interpolation='nearest')
         self.state_plot.norm.vmin, self.state_plot.norm.vmax = -1, 1
@@ -263,7 +366,7 @@ class VisualHopfield(HopfieldNetwork):
         """
         Draws a heatmap of the network's weight matrix.
         """
-        self.cmap = self.weight_diagram.imshow(self._train_act(self.weights()),
+        self.cmap = self.weight_diagram.imshow(self._activated_weights(),
                                                vmin=-1, vmax=1, cmap='viridis',
                                                aspect='auto')
         cbar = self.network_fig.colorbar(self.cmap)
@@ -0,0 +1,249 @@
+/*  Vector field function and events for Radau integrator.
+  This code was automatically generated by PyDSTool, but may be modified by hand. */
+
+#include <math.h>
+#include <Python.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include "events.h"
+#include "maxmin.h"
+#include "signum.h"
+#include "vfield.h"
+
+extern double *gICs;
+extern double **gBds;
+extern double globalt0;
+
+static double pi = 3.1415926535897931;
+
+double signum(double x)
+{
+  if (x<0) {
+    return -1;
+  }
+  else if (x==0) {
+    return 0;
+  }
+  else if (x>0) {
+    return 1;
+  }
+  else {
+    /* must be that x is Not-a-Number */
+    return x;
+  }
+}
+
+
+/* Variable, aux variable, parameter, and input definitions: */ 
+#define Gamma_out_minus_dp_nu	p_[0]
+#define Gamma_out_minus_dp_phi	p_[1]
+#define Gamma_out_minus_p_nu	p_[2]
+#define Gamma_out_minus_p_phi	p_[3]
+#define Gamma_out_plus_dp_nu	p_[4]
+#define Gamma_out_plus_dp_phi	p_[5]
+#define Gamma_out_plus_p_nu	p_[6]
+#define Gamma_out_plus_p_phi	p_[7]
+#define d	p_[8]
+#define g	p_[9]
+#define nu	Y_[0]
+#define phi	Y_[1]
+
+double Gamma_out_minus(unsigned n_, double t, double *Y_, double *p_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_);
+double Gamma_out_plus(unsigned n_, double t, double *Y_, double *p_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_);
+
+double Gamma_out_minus_fn(double __x__, double __y__, double *p_, double *wk_, double *xv_);
+double Gamma_out_plus_fn(double __x__, double __y__, double *p_, double *wk_, double *xv_);
+double __maxof2(double e1_, double e2_, double *p_, double *wk_, double *xv_);
+double __maxof3(double e1_, double e2_, double e3_, double *p_, double *wk_, double *xv_);
+double __maxof4(double e1_, double e2_, double e3_, double e4_, double *p_, double *wk_, double *xv_);
+double __minof2(double e1_, double e2_, double *p_, double *wk_, double *xv_);
+double __minof3(double e1_, double e2_, double e3_, double *p_, double *wk_, double *xv_);
+double __minof4(double e1_, double e2_, double e3_, double e4_, double *p_, double *wk_, double *xv_);
+double __rhs_if(int cond_, double e1_, double e2_, double *p_, double *wk_, double *xv_);
+double getbound(char *name, int which_bd, double *p_, double *wk_, double *xv_);
+double globalindepvar(double t, double *p_, double *wk_, double *xv_);
+double initcond(char *varname, double *p_, double *wk_, double *xv_);
+int getindex(char *name, double *p_, double *wk_, double *xv_);
+int heav(double x_, double *p_, double *wk_, double *xv_);
+void jacobian(unsigned n_, unsigned np_, double t, double *Y_, double *p_, double **f_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_);
+
+int N_EVENTS = 2;
+void assignEvents(EvFunType *events){
+ events[0] = &Gamma_out_minus;
+events[1] = &Gamma_out_plus;
+
+}
+
+void auxvars(unsigned, unsigned, double, double*, double*, double*, unsigned, double*, unsigned, double*);
+void jacobian(unsigned, unsigned, double, double*, double*, double**, unsigned, double*, unsigned, double*);
+void jacobianParam(unsigned, unsigned, double, double*, double*, double**, unsigned, double*, unsigned, double*);
+int N_AUXVARS = 0;
+
+
+int N_EXTINPUTS = 0;
+
+
+void vfieldfunc(unsigned n_, unsigned np_, double t, double *Y_, double *p_, double *f_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_){
+
+f_[0] = -d*nu+g*sin(phi)*cos(phi)-sin(phi);
+f_[1] = nu;
+
+}
+
+
+
+
+double Gamma_out_minus_fn(double __x__, double __y__, double *p_, double *wk_, double *xv_) {
+
+
+return (Gamma_out_minus_dp_phi*(Gamma_out_minus_p_nu-__y__)-(Gamma_out_minus_p_phi-__x__)*Gamma_out_minus_dp_nu)/sqrt(Gamma_out_minus_dp_phi*Gamma_out_minus_dp_phi+Gamma_out_minus_dp_nu*Gamma_out_minus_dp_nu);
+
+}
+
+
+double Gamma_out_plus_fn(double __x__, double __y__, double *p_, double *wk_, double *xv_) {
+
+
+return (Gamma_out_plus_dp_phi*(Gamma_out_plus_p_nu-__y__)-(Gamma_out_plus_p_phi-__x__)*Gamma_out_plus_dp_nu)/sqrt(Gamma_out_plus_dp_phi*Gamma_out_plus_dp_phi+Gamma_out_plus_dp_nu*Gamma_out_plus_dp_nu);
+
+}
+
+
+double __maxof2(double e1_, double e2_, double *p_, double *wk_, double *xv_) {
+if (e1_ > e2_) {return e1_;} else {return e2_;};
+}
+
+
+double __maxof3(double e1_, double e2_, double e3_, double *p_, double *wk_, double *xv_) {
+double temp_;
+if (e1_ > e2_) {temp_ = e1_;} else {temp_ = e2_;};
+if (e3_ > temp_) {return e3_;} else {return temp_;};
+}
+
+
+double __maxof4(double e1_, double e2_, double e3_, double e4_, double *p_, double *wk_, double *xv_) {
+double temp_;
+if (e1_ > e2_) {temp_ = e1_;} else {temp_ = e2_;};
+if (e3_ > temp_) {temp_ = e3_;};
+if (e4_ > temp_) {return e4_;} else {return temp_;};
+}
+
+
+double __minof2(double e1_, double e2_, double *p_, double *wk_, double *xv_) {
+if (e1_ < e2_) {return e1_;} else {return e2_;};
+}
+
+
+double __minof3(double e1_, double e2_, double e3_, double *p_, double *wk_, double *xv_) {
+double temp_;
+if (e1_ < e2_) {temp_ = e1_;} else {temp_ = e2_;};
+if (e3_ < temp_) {return e3_;} else {return temp_;};
+}
+
+
+double __minof4(double e1_, double e2_, double e3_, double e4_, double *p_, double *wk_, double *xv_) {
+double temp_;
+if (e1_ < e2_) {temp_ = e1_;} else {temp_ = e2_;};
+if (e3_ < temp_) {temp_ = e3_;};
+if (e4_ < temp_) {return e4_;} else {return temp_;};
+}
+
+
+double __rhs_if(int cond_, double e1_, double e2_, double *p_, double *wk_, double *xv_) {
+  if (cond_) {return e1_;} else {return e2_;};
+}
+
+
+double getbound(char *name, int which_bd, double *p_, double *wk_, double *xv_) {
+  return gBds[which_bd][getindex(name, p_, wk_, xv_)];
+}
+
+
+double globalindepvar(double t, double *p_, double *wk_, double *xv_) {
+  return globalt0+t;
+}
+
+
+double initcond(char *varname, double *p_, double *wk_, double *xv_) {
+
+  if (strcmp(varname, "nu")==0)
+	return gICs[0];
+  else if (strcmp(varname, "phi")==0)
+	return gICs[1];
+  else {
+	fprintf(stderr, "Invalid variable name %s for initcond call\n", varname);
+	return 0.0/0.0;
+	}
+}
+
+
+int getindex(char *name, double *p_, double *wk_, double *xv_) {
+
+  if (strcmp(name, "nu")==0)
+	return 0;
+  else if (strcmp(name, "phi")==0)
+	return 1;
+  else if (strcmp(name, "Gamma_out_minus_dp_nu")==0)
+	return 2;
+  else if (strcmp(name, "Gamma_out_minus_dp_phi")==0)
+	return 3;
+  else if (strcmp(name, "Gamma_out_minus_p_nu")==0)
+	return 4;
+  else if (strcmp(name, "Gamma_out_minus_p_phi")==0)
+	return 5;
+  else if (strcmp(name, "Gamma_out_plus_dp_nu")==0)
+	return 6;
+  else if (strcmp(name, "Gamma_out_plus_dp_phi")==0)
+	return 7;
+  else if (strcmp(name, "Gamma_out_plus_p_nu")==0)
+	return 8;
+  else if (strcmp(name, "Gamma_out_plus_p_phi")==0)
+	return 9;
+  else if (strcmp(name, "d")==0)
+	return 10;
+  else if (strcmp(name, "g")==0)
+	return 11;
+  else {
+	fprintf(stderr, "Invalid name %s for getindex call\n", name);
+	return 0.0/0.0;
+	}
+}
+
+
+int heav(double x_, double *p_, double *wk_, double *xv_) {
+  if (x_>0.0) {return 1;} else {return 0;}
+}
+
+
+void jacobian(unsigned n_, unsigned np_, double t, double *Y_, double *p_, double **f_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_) {
+
+
+f_[0][0] = 0;
+f_[0][1] = g*(cos(phi)*cos(phi)-sin(phi)*sin(phi))-cos(phi);
+f_[1][0] = 1;
+f_[1][1] = -d;
+
+ ;
+
+}
+
+void auxvars(unsigned n_, unsigned np_, double t, double *Y_, double *p_, double *f_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_){
+
+
+}
+
+double Gamma_out_minus(unsigned n_, double t, double *Y_, double *p_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_) {
+return  Gamma_out_minus_fn(phi,nu, p_, wk_, xv_); 
+}
+
+double Gamma_out_plus(unsigned n_, double t, double *Y_, double *p_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_) {
+return  Gamma_out_plus_fn(phi,nu, p_, wk_, xv_); 
+}
+
+
+void massMatrix(unsigned n_, unsigned np_, double t, double *Y_, double *p_, double **f_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_) {
+}
+
+void jacobianParam(unsigned n_, unsigned np_, double t, double *Y_, double *p_, double **f_, unsigned wkn_, double *wk_, unsigned xvn_, double *xv_) {
+}
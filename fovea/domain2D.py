@@ -267,7 +267,7 @@ class GUI_domain_handler(object):
         # display c
         #self.gui.selected_object_temphandle = self.gui.ax.plot(ev.xdata, ev.ydata, 'go')[0]
         self.gui.selected_object_temphandle = ev.inaxes.plot(ev.xdata, ev.ydata, 'go')[0]
-        self.gui.fig.canvas.draw()
+        self.gui.fig.canvas.draw_idle()
         # switch control to make_dom_p1
         self.gui.mouse_cid = self.gui.fig.canvas.mpl_connect('button_release_event', self.mouse_event_make_dom_p1)
 
@@ -332,7 +332,7 @@ class GUI_domain_handler(object):
                 except TypeError:
                     pass
 
-        self.gui.fig.canvas.draw()
+        self.gui.fig.canvas.draw_idle()
 
 
 #Local import
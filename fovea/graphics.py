@@ -17,13 +17,16 @@ import os
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button, RectangleSelector
+from matplotlib.backend_bases import TimerBase
+from matplotlib.lines import Line2D
 from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
-from copy import copy
-from math import *
+from scipy.spatial import cKDTree
+from copy import copy, deepcopy
+from math import atan2, pi, hypot, degrees
 from collections import OrderedDict
+from contextlib import contextmanager
 import hashlib, time
-import euclid as euc
 
 import warnings
 
@@ -54,45 +57,377 @@ def force_line_to_extent(a, b, p_domain, coordnames):
     The infinite line through points *a* and *b*
     cuts the rectangular domain at the two points returned.
 
-    a, b are Point2D objects for the line endpoints.
+    a, b are Point2D objects for the line endpoints (or plain (x, y)
+    sequences).
+
+    Uses the Liang-Barsky parametric clip: the line is a + t*(b-a), and
+    each side of the rectangle bounds t from one side. The returned points
+    are ordered by increasing t (i.e. the first lies on the side of *a*).
     """
     x, y = coordnames
-    # line is a euclid.Line2 (infinite in both directions)
-    a_pt = euc.Point2(a[x],a[y])
-    b_pt = euc.Point2(b[x],b[y])
-    #plt.plot(np.array([a_pt, b_pt]).T[0],
-    #         np.array([a_pt, b_pt]).T[1], 'r')
-    line = euc.Line2(a_pt, b_pt)
-    # test each of four sides as finite line segments
-    combos = ( (0,0,0,1), (0,0,1,0), (1,1,0,1), (1,1,1,0) )
-    p1 = p2 = None
-    for xi1, yi1, xi2, yi2 in combos:
-        bd1 = euc.Point2(p_domain[x][xi1], p_domain[y][yi1])
-        bd2 = euc.Point2(p_domain[x][xi2], p_domain[y][yi2])
-        #plt.plot(np.array([bd1, bd2]).T[0],
-        #         np.array([bd1, bd2]).T[1], 'k')
-        border_seg = euc.LineSegment2(bd1, bd2)
-        pt = line.intersect(border_seg)
-        if pt is not None:
-            # intersection exists
-            # truncate or extend whichever point of line is closer to
-            # border segment
-            dist1 = border_seg.distance(line.p1)
-            dist2 = border_seg.distance(line.p2)
-            if dist1 > dist2:
-                if p2 is None:
-                    p2 = pt
-                else:
-                    p1 = pt
-            else:
-                if p1 is None:
-                    p1 = pt
-                else:
-                    p2 = pt
-    if p1 is not None and p2 is not None:
-        return pp.Point2D(p1), pp.Point2D(p2)
-    else:
+    try:
+        ax, ay = a[x], a[y]
+        bx, by = b[x], b[y]
+    except (IndexError, TypeError, ValueError):
+        # not indexable by coordinate name: take the values in order
+        ax, ay = a[0], a[1]
+        bx, by = b[0], b[1]
+    dx = bx - ax
+    dy = by - ay
+    if dx == 0 and dy == 0:
+        raise ValueError("Line endpoints coincide")
+    xL, xR = p_domain[x]
+    yB, yT = p_domain[y]
+    # Axis-parallel lines need no clipping arithmetic. (Endpoint outcodes,
+    # as in Cohen-Sutherland, can't be used to reject: the line is infinite.)
+    if dx == 0:
+        if not xL <= ax <= xR:
+            raise ValueError("No intersection")
+        ends = (yB, yT) if dy > 0 else (yT, yB)
+        return pp.Point2D(ax, ends[0]), pp.Point2D(ax, ends[1])
+    if dy == 0:
+        if not yB <= ay <= yT:
+            raise ValueError("No intersection")
+        ends = (xL, xR) if dx > 0 else (xR, xL)
+        return pp.Point2D(ends[0], ay), pp.Point2D(ends[1], ay)
+    t_enter = -np.inf
+    t_exit = np.inf
+    for p, q in ((-dx, ax - xL), (dx, xR - ax),
+                 (-dy, ay - yB), (dy, yT - ay)):
+        # (not max/min: the star import from PyDSTool may shadow the
+        # builtins with numpy's, which take a second argument as the axis)
+        t = q / p
+        if p < 0:
+            if t > t_enter:
+                t_enter = t
+        elif t < t_exit:
+            t_exit = t
+    if t_enter > t_exit:
         raise ValueError("No intersection")
+    return pp.Point2D(ax + t_enter*dx, ay + t_enter*dy), \
+           pp.Point2D(ax + t_exit*dx, ay + t_exit*dy)
+
+
+_parsed_styles = {}
+
+try:
+    from matplotlib.axes._base import _process_plot_format
+except ImportError:
+    # private to matplotlib, so may move or go: same parse using the
+    # public style tables
+    def _process_plot_format(fmt):
+        """
+        (linestyle, marker, color) given by a plot format string such as
+        'r--o', with None for fields it leaves unspecified.
+        """
+        try:
+            # a whole-string color, e.g. 'green' or '0.5', unless it is
+            # one of the digit markers
+            if not fmt.isdigit():
+                return None, None, mpl.colors.to_rgba(fmt)
+        except ValueError:
+            pass
+        linestyle = marker = color = None
+        i = 0
+        while i < len(fmt):
+            c = fmt[i]
+            if fmt[i:i+2] in Line2D.lineStyles:
+                field, val, i = 'linestyle', fmt[i:i+2], i+2
+            elif c in Line2D.lineStyles:
+                field, val, i = 'linestyle', c, i+1
+            elif c in Line2D.markers:
+                field, val, i = 'marker', c, i+1
+            elif c in mpl.colors.get_named_colors_mapping() and len(c) == 1:
+                field, val, i = 'color', c, i+1
+            elif c == 'C' and fmt[i+1:i+2].isdigit():
+                field, val, i = 'color', mpl.colors.to_rgba(fmt[i:i+2]), i+2
+            else:
+                raise ValueError("Unrecognized character %s in format "
+                                 "string %r" % (c, fmt))
+            if field == 'linestyle':
+                if linestyle is not None:
+                    raise ValueError("Illegal format string %r; two "
+                                     "linestyle symbols" % fmt)
+                linestyle = val
+            elif field == 'marker':
+                if marker is not None:
+                    raise ValueError("Illegal format string %r; two "
+                                     "marker symbols" % fmt)
+                marker = val
+            else:
+                if color is not None:
+                    raise ValueError("Illegal format string %r; two "
+                                     "color symbols" % fmt)
+                color = val
+        if linestyle is None and marker is not None:
+            linestyle = 'None'
+        if marker is None and linestyle is not None:
+            marker = 'None'
+        return linestyle, marker, color
+
+# number of speed color arrays kept by diagnosticGUI._speed_colors
+_RGBA_CACHE_SIZE = 32
+
+# RGBA table of the speed colormap, indexed the same way the Colormap
+# object bins its input
+_SPEED_LUT = plt.cm.jet(np.linspace(0, 1, plt.cm.jet.N)) #gist_heat
+
+
+def _lut_colors(vals, vmax, lut=_SPEED_LUT):
+    """
+    Map vals, normalized to [0, vmax] and clipped, to rows of lut.
+    Equivalent to cmap(Normalize(0, vmax)(vals)) without the per-call
+    Normalize and Colormap overhead. NaNs map to transparent black.
+    """
+    n = len(lut)
+    t = np.asarray(vals, dtype=float) / float(vmax) * n
+    bad = np.isnan(t)
+    if bad.any():
+        t[bad] = 0
+    rgba = lut[np.clip(t, 0, n-1).astype(int)]
+    if bad.any():
+        rgba[bad] = 0
+    return rgba
+
+def _parse_style(style):
+    """
+    Plot keyword arguments (color as RGBA, linestyle, marker) equivalent
+    to a format string style such as 'b-' or 'kd'; fields the string
+    leaves unspecified are omitted. Results are cached, since the same
+    few style strings are used for every dataset on each layer build.
+
+    Raises ValueError for an invalid format string, as plot would.
+    """
+    try:
+        return _parsed_styles[style]
+    except KeyError:
+        linestyle, marker, color = _process_plot_format(style)
+        kw = {}
+        if linestyle is not None:
+            kw['linestyle'] = linestyle
+        if marker is not None:
+            kw['marker'] = marker
+        if color is not None:
+            kw['color'] = mpl.colors.to_rgba(color)
+        _parsed_styles[style] = kw
+        return kw
+
+
+def _style_color(style):
+    """
+    RGBA color given by a plot format string (see _parse_style), or
+    None if it specifies no color.
+
+    Non-string styles (e.g. a per-point color array) give their first
+    entry, as before.
+    """
+    if not isinstance(style, str):
+        return style[0]
+    try:
+        return _parse_style(style).get('color')
+    except ValueError:
+        return None
+
+
+def _set_lim(ax, axis, lim):
+    """
+    Set the 'x' or 'y' limits of ax to lim unless they are already equal
+    (setting identical limits would still mark the figure stale). lim may
+    be None or contain None, as for set_xlim.
+    """
+    try:
+        if tuple(getattr(ax, 'get_%slim' % axis)()) == tuple(lim):
+            return
+    except TypeError:
+        # None
+        pass
+    getattr(ax, 'set_%slim' % axis)(lim)
+
+
+def _subplot_index(ixstr):
+    """
+    Zero-based (row, col) of an arrange_fig sub-plot key, which is either
+    a string of two one-based digits (e.g. '12') or, for grids with more
+    than nine rows or columns, a one-based (row, col) pair.
+    """
+    if isinstance(ixstr, str):
+        if len(ixstr) != 2:
+            raise ValueError("Sub-plot position %r must be two digits, or a "
+                             "(row, col) pair" % ixstr)
+        return int(ixstr[0])-1, int(ixstr[1])-1
+    row, col = ixstr
+    return row-1, col-1
+
+
+def _set_lims(ax, scale):
+    """
+    Apply a [xdom, ydom] scale to ax with _set_lim. The scale, or either
+    domain, may be None to leave those limits alone.
+    """
+    if scale is None:
+        return
+    # scale may be [None, None], [None, [ylo, yhi]], etc.
+    if scale[0] is not None:
+        _set_lim(ax, 'x', scale[0])
+    if scale[1] is not None:
+        _set_lim(ax, 'y', scale[1])
+
+
+def _same_line_kind(old, new):
+    """
+    True if dataset fields new could be drawn by updating the arrays of
+    the line plotted for old: plain (not artist) data of the same
+    dimension, and an equal style.
+    """
+    if isinstance(old['data'], mpl.artist.Artist) or \
+       isinstance(new['data'], mpl.artist.Artist) or \
+       len(old['data']) != len(new['data']):
+        return False
+    if old['style'] is new['style']:
+        return True
+    try:
+        return isinstance(new['style'], (str, dict)) and \
+               bool(old['style'] == new['style'])
+    except ValueError:
+        # arrays in a style dict
+        return False
+
+
+def _nearest_index(times, t):
+    """
+    Index of the value in times closest to t (the first, if two are
+    equally close, as for argmin). times must be non-decreasing, as for a
+    Pointset's independent variable, so a binary search suffices.
+    """
+    ix = int(np.searchsorted(times, t))
+    if ix == len(times) or \
+       (ix > 0 and t - times[ix-1] <= times[ix] - t):
+        # the left neighbour may be the last of repeated samples: use
+        # the first of them
+        return int(np.searchsorted(times, times[ix-1]))
+    return ix
+
+
+def _line_set(vals, span):
+    """
+    Coordinates of parallel lines at positions *vals*, each covering the
+    interval *span*, as one NaN-separated pair [span coords, vals coords]
+    that plots as a single Line2D.
+    """
+    vals = np.asarray(vals, dtype=float)
+    n = len(vals)
+    nans = np.full(n, np.nan)
+    return [np.tile([span[0], span[1], np.nan], n),
+            np.column_stack((vals, vals, nans)).ravel()]
+
+
+def _circle_collection(ax, pos, radius, **kwargs):
+    """
+    Circles of the given radii centred at the (x, y) positions *pos*, in
+    data coordinates of *ax*, as a single EllipseCollection.
+    """
+    offsets = np.column_stack((pos[0], pos[1]))
+    diameters = 2*np.asarray(radius, dtype=float)
+    try:
+        return mpl.collections.EllipseCollection(diameters, diameters, 0,
+                    units='xy', offsets=offsets, offset_transform=ax.transData,
+                    **kwargs)
+    except AttributeError:
+        # matplotlib < 3.6 names the offset transform differently
+        return mpl.collections.EllipseCollection(diameters, diameters, 0,
+                    units='xy', offsets=offsets, transOffset=ax.transData,
+                    **kwargs)
+
+
+def _layer_signature(lay):
+    """
+    Digest of a layer's datasets (names, numerical data and the fields
+    used to create their artists), used to tell whether a forced rebuild
+    would actually draw anything different.
+    """
+    h = hashlib.sha1()
+    for dname in sorted(lay.data):
+        h.update(repr(dname).encode())
+        for field, val in sorted(lay.data[dname].items()):
+            if field in ('buffer', 'dirty'):
+                # append_data's storage behind 'data', build_layer's flag
+                continue
+            h.update(repr(field).encode())
+            try:
+                h.update(np.asarray(val, dtype=float).tobytes())
+            except (TypeError, ValueError):
+                # strings, classes, artists, ragged data
+                h.update(repr(val).encode())
+    return h.digest()
+
+
+class _LazyTrajs(dict):
+    """
+    Internal dict type of a layer's trajs field: the interpolated
+    trajectories of its datasets, keyed by data name. Trajectories made
+    stale by add_data, set_data or append_data are only rebuilt when the
+    dict is read, so appending to a dataset point by point doesn't
+    re-interpolate it every time.
+    """
+    def __init__(self, plotter, layer_struct, layer_name):
+        dict.__init__(self)
+        # names of datasets whose trajectories need rebuilding
+        self.stale = set()
+        self._plotter = plotter
+        self._layer_struct = layer_struct
+        self._layer_name = layer_name
+
+    def _resolve(self):
+        if self.stale:
+            self._plotter._update_traj(self._layer_struct, self._layer_name,
+                                       names=list(self.stale))
+
+    def __getitem__(self, name):
+        self._resolve()
+        return dict.__getitem__(self, name)
+
+    def get(self, name, default=None):
+        self._resolve()
+        return dict.get(self, name, default)
+
+    def __contains__(self, name):
+        self._resolve()
+        return dict.__contains__(self, name)
+
+    def __iter__(self):
+        self._resolve()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._resolve()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self._resolve()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def keys(self):
+        self._resolve()
+        return dict.keys(self)
+
+    def values(self):
+        self._resolve()
+        return dict.values(self)
+
+    def items(self):
+        self._resolve()
+        return dict.items(self)
+
+    def copy(self):
+        self._resolve()
+        return dict(dict.items(self))
+
+    def __repr__(self):
+        self._resolve()
+        return dict.__repr__(self)
 
 
 class Plotter(object):
@@ -122,6 +457,14 @@ class Plotter(object):
         self.currFig = None
         # record whether this class ever called show()
         self.shown = False
+        # per-figure (by fignum) axes backgrounds without dynamic layers,
+        # captured on each full draw for blitting
+        self._bg_cache = {}
+        # nesting depth of _batch_updates blocks, and the figures whose
+        # redraw they deferred (name -> whether a full redraw is needed)
+        self._batch_depth = 0
+        self._deferred_draws = {}
+        self._draw_cids = {}
 
     def auto_scale_domain(self, xcushion=0, ycushion=0, subplot=None, figure=None):
         """
@@ -132,45 +475,40 @@ class Plotter(object):
         """
         # ISSUE: Setting domains at the figure level (as opposed to subplot level) doesn't work.
         # Changes will likely need to be made in other functions, not here (such as build_layers or build_plotter)
-        x_extent = [0, 0]
-        y_extent = [0, 0]
-
-        def auto_minmax(x, f):
-            """
-            Scalar inputs are automatically the min/max.
-            """
-            try:
-                out = f(x)
-            except TypeError:
-                out = x
-            return out
-
         if not figure:
             figure = self.currFig
 
-        found_fig = False
-        for figName, fig in self.figs.items():
-            if figure == figName:
-                found_fig = True
-            # Extract only those layers in the chosen subplot.
-            if subplot:
-                subplot_struct = fig.arrange[subplot]
-                subplot_layers = subplot_struct['layers']
-                layer_info = { layer_name : fig.layers[layer_name] for layer_name in subplot_layers }
-            else:
-                layer_info = fig.layers
-            for layerName, layer in layer_info.items():
-                if layer.kind != 'text':
-                   for dName, d in list(layer['data'].items()):
-                       data_points = d['data']
-                       x_extent[0] = min(auto_minmax(data_points[0], min), x_extent[0])
-                       x_extent[1] = max(auto_minmax(data_points[0], max), x_extent[1])
-                       y_extent[0] = min(auto_minmax(data_points[1], min), y_extent[0])
-                       y_extent[1] = max(auto_minmax(data_points[1], max), y_extent[1])
-
-        if not found_fig:
+        try:
+            fig = self.figs[figure]
+        except KeyError:
             raise ValueError("No such figure")
 
+        # Extract only those layers in the chosen subplot.
+        if subplot:
+            subplot_struct = fig.arrange[subplot]
+            subplot_layers = subplot_struct['layers']
+            layer_info = { layer_name : fig.layers[layer_name] for layer_name in subplot_layers }
+        else:
+            layer_info = fig.layers
+
+        # Reduce each dataset to its extent in C, then combine the (few)
+        # per-dataset extents. Scalar data (single points) reduce to
+        # themselves. The origin is always included, as before.
+        mins = [[0], [0]]
+        maxs = [[0], [0]]
+        for layerName, layer in layer_info.items():
+            if layer.kind != 'text':
+                for dName, d in layer['data'].items():
+                    data_points = d['data']
+                    for i in (0, 1):
+                        coords = np.asarray(data_points[i], dtype=float)
+                        # NaNs only separate line pieces (see _line_set)
+                        mins[i].append(np.nanmin(coords))
+                        maxs[i].append(np.nanmax(coords))
+
+        x_extent = [min(mins[0]), max(maxs[0])]
+        y_extent = [min(mins[1]), max(maxs[1])]
+
         if subplot:
             x_length = x_extent[1] - x_extent[0]
             y_length = y_extent[1] - y_extent[0]
@@ -178,9 +516,9 @@ class Plotter(object):
                                              tuple([y_extent[0] - ycushion*y_length, y_extent[1] + ycushion*y_length])]
         else:
             fig.domain = (x_extent, y_extent)
-            plt.figure(fig.fignum)
-            plt.xlim(x_extent)
-            plt.ylim(y_extent)
+            ax = self._figure_window(fig).gca()
+            ax.set_xlim(x_extent)
+            ax.set_ylim(y_extent)
 
     def set_active_layer(self, layer, figure=None):
         """
@@ -281,29 +619,35 @@ class Plotter(object):
         if newFig in self.figs:
             raise KeyError("New figure label already exists!")
 
-        self.currFig = newFig
-
         old = self.figs[oldFig]
+        self.currFig = newFig
 
-        figAttr = args()
-        figAttr.title = old.title
-        figAttr.xlabel = old.xlabel
-        figAttr.ylabel = old.ylabel
-        figAttr.display = old.display
+        # share the (immutable) figure settings, e.g. title and domain
+        figAttr = args(**{k: v for k, v in old.items() if k not in
+                          ('fignum', 'layers', 'shape', 'arrange', 'window')})
         self._max_fig_num += 1
         figAttr.fignum = self._max_fig_num
         figAttr.shape = [1,1]
         figAttr.arrange = []
         figAttr.window = None
-        figAttr.autoscaling = True
-
         figAttr.layers = {}
 
         self.figs.update({newFig: figAttr})
 
-        for layer in old.layers:
-            oldLay = self.figs[oldFig].layers[layer]
-            self.add_layer(layer, display=oldLay.display, zindex=oldLay.zindex, style=oldLay.style)
+        for layer, oldLay in old.layers.items():
+            self.add_layer(layer, display=oldLay.display, zindex=oldLay.zindex, style=oldLay.style,
+                           kind=oldLay.kind, scale=oldLay.scale, dynamic=oldLay.dynamic,
+                           batched=oldLay.batched, axes_vars=list(oldLay.axes_vars))
+            newLay = figAttr.layers[layer]
+            # only the numerical data are copied deeply; sub-plot
+            # assignments refer to the old arrangement, so are dropped
+            for dname, dstruct in oldLay.data.items():
+                newData = {k: v for k, v in dstruct.items() if k != 'buffer'}
+                newData['data'] = deepcopy(dstruct['data'])
+                newData['subplot'] = None
+                newLay.data[dname] = newData
+            # trajectories are rebuilt for the copies if requested
+            newLay.stale_trajs.update(newLay.data)
 
 
     def set_fig(self, label=None, **kwargs):
@@ -357,7 +701,8 @@ class Plotter(object):
 
         shape      [rows,cols] where rows is number of rows starting from 1
                    and cols is number of cols starting from 1
-        arrPlots   Dict of dicts of subplots indexed by row-col.  Each
+        arrPlots   Dict of dicts of subplots indexed by row-col, e.g. '12'
+                   (or (1, 12) for grids of more than nine rows or cols). Each
                    subplot dict has the following keys:
 
                    name        Name of the subplot to appear in figure
@@ -375,19 +720,17 @@ class Plotter(object):
         if len(shape) != 2:
             raise ValueError("shape must be (rows,cols)")
 
-        # make copy of arrPlots in case change singleton layer names to lists
-        arrPlots = copy(arrPlots)
-
+        # arrPlots is only validated here (not altered), and the figure's
+        # arrange attribute is replaced wholesale, so no copy is needed.
         #Ensure subplot positions are consistent with figure shape.
+        rows, cols = shape
         for ixstr, spec in arrPlots.items():
-            if int(ixstr[0])*int(ixstr[1]) > shape[0]*shape[1]:
+            i, j = _subplot_index(ixstr)
+            if not (0 <= i < rows and 0 <= j < cols):
                 raise ValueError("Position does not exist in subplot arrangement.")
 
-            layer_info = spec['layers']
             if len(spec['axes_vars']) > 3:
                 raise ValueError("Cannot have more than three axis titles.")
-            else:
-                axes_vars = spec['axes_vars']
 
         fig_struct.shape = shape
         fig_struct.arrange = arrPlots
@@ -407,6 +750,8 @@ class Plotter(object):
                      'text', etc.
         scale   a pair of axes scale pairs or None
         zindex  (currently unused)
+        batched draw all 2D datasets sharing a style string (and sub-plot)
+                     as one line (default False), see _build_batches
         """
         # ISSUE: Not sure that figure or whole layer display attribute values
         # are respected
@@ -433,7 +778,14 @@ class Plotter(object):
         layAttrs.scale = None
         layAttrs.kind = 'data'
         layAttrs.dynamic = False
-        layAttrs.trajs = {}
+        layAttrs.trajs = _LazyTrajs(self, layAttrs, layer_name)
+        # names of datasets whose trajs need rebuilding when next read
+        layAttrs.stale_trajs = layAttrs.trajs.stale
+        # content signature as of the last forced build (see build_layers)
+        layAttrs.drawn_sig = None
+        # batched layers: datasets drawn by each batch line (see _build_batches)
+        layAttrs.batched = False
+        layAttrs.batch_state = {}
         layAttrs.axes_vars = []
         layAttrs.handles = OrderedDict({})
         #layAttrs.linewidth = None
@@ -490,10 +842,12 @@ class Plotter(object):
         """
         patch is a matplotlib patch class. Accepts kwargs for patch objects.
         """
+        # convert once, and store the array
         try:
-            size = np.shape(data)
+            data = np.asarray(data)
         except:
             raise TypeError("Data must be castable to a numpy array")
+        size = data.shape
 
         # Check to see that there is an x- and y- dataset
         try:
@@ -605,11 +959,14 @@ class Plotter(object):
         *display* option (default True) controls whether the data will be
         visible by default.
         """
-        # Check to see that data is a list or array
-        try:
-            size = np.shape(data)
-        except:
-            raise TypeError("Data must be castable to a numpy array")
+        # Check to see that data is a list or array, converting it once and
+        # storing the array (artists, e.g. a LineCollection, are kept as given)
+        if not isinstance(data, mpl.artist.Artist):
+            try:
+                data = np.asarray(data)
+            except:
+                raise TypeError("Data must be castable to a numpy array")
+        size = np.shape(data)
 
         # Check to see that there is an x- and y- (or z-) dataset
         try:
@@ -646,14 +1003,25 @@ class Plotter(object):
 
         if log:
             log.msg("Added plot data", figure=figure, layer=layer, name=name)
+        old = d.get(name)
         d.update({name: {'data': data, 'style': style, 'linewidth':linewidth, 'markersize':markersize,
-                         'zorder':zorder,'display': display, 'subplot': subplot, 'selected':False}})
-        layer_struct.force = force
+                         'zorder':zorder,'display': display, 'subplot': subplot, 'selected':False,
+                         'dirty': True}})
+        if old is not None and name in layer_struct.handles and \
+           _same_line_kind(old, d[name]):
+            # only the arrays changed: build_layer updates the existing
+            # line in place, instead of the whole layer being rebuilt
+            pass
+        else:
+            layer_struct.force = force
 
         # ISSUE: _update_traj only meaningful for time-param'd trajectories
         # Maybe a different, more general purpose solution is needed
-
-        self._update_traj(figure, layer, traj = traj)
+        if traj is None:
+            # interpolated from the data when trajs is next read
+            layer_struct.stale_trajs.add(name)
+        else:
+            self._update_traj(layer_struct, layer, traj = traj, names=[name])
 
     def set_point(self, name, pt, layer, figure=None):
         """
@@ -669,6 +1037,9 @@ class Plotter(object):
         except KeyError:
             # object not actually plotted yet
             pass
+        else:
+            if lay.dynamic:
+                self._blit_dynamic(figure)
 
     def set_data_2(self, label, layer, figure=None, **kwargs):
         """
@@ -740,17 +1111,19 @@ class Plotter(object):
                             #print("OBJ: ", obj)
                             #obj.set_data(objdata['data'])
 
-        self._update_traj(figure, layer)
+        if 'data' in kwargs:
+            layer_struct.stale_trajs.update(kwargs['data'].keys())
 
 
 
-    def _update_traj(self, figure_name, layer_name, traj= None):
+    def _update_traj(self, layer_struct, layer_name, traj= None, names=None):
         """
         Create an interpolated trajectory from the data in the layer
         This may no longer be necessary (it's not general purpose for fovea)
+
+        The caller passes the layer struct it has already resolved.
+        Optional *names* restricts the rebuild to those datasets.
         """
-        fig_struct = self.figs[figure_name]
-        layer_struct = fig_struct.layers[layer_name]
 
         #pointset_to_traj requires an independent variable.
         try:
@@ -761,10 +1134,22 @@ class Plotter(object):
 
         ##ISSUE: Should this loop through all the dstructs? Seems like it just needs the one associated
         ## with the call to add_data.
-        for name, dstruct in layer_struct.data.items():
+        if names is None:
+            names = list(layer_struct.data.keys())
+        for name in names:
+            layer_struct.stale_trajs.discard(name)
+            layer_struct.trajs.pop(name, None)
+            try:
+                dstruct = layer_struct.data[name]
+            except KeyError:
+                # data removed since it was marked stale
+                continue
             if traj is not None:
-                layer_struct.trajs[name] = pointset_to_traj(traj)
-                layer_struct.trajs[name].name = layer_name+'.'+name
+                # (named before storing: reading trajs back would rebuild
+                # the other stale ones mid-loop)
+                new_traj = pointset_to_traj(traj)
+                new_traj.name = layer_name+'.'+name
+                layer_struct.trajs[name] = new_traj
             # catch for when the data is individual points
             else:
                 try:
@@ -776,6 +1161,13 @@ class Plotter(object):
                 except ValueError:
                     pass
 
+    def _resolve_trajs(self, figure, layer):
+        """
+        Return the trajs dict of the given layer (which rebuilds any stale
+        trajectories as it is read).
+        """
+        return self._resolve_layer(figure, layer).trajs
+
 
     def toggle_display(self, names=None, layer=None, figure=None, log=None):
         """
@@ -800,12 +1192,17 @@ class Plotter(object):
                 # toggle whole layer display
                 layer_struct.display = not layer_struct.display
         else:
-            layer_struct = self._resolve_layer(figure, layer)
+            if layer is None:
+                # default layer, as documented
+                layer_struct = self.active_layer_structs[1]
+            else:
+                layer_struct = self._resolve_layer(figure, layer)
             if isinstance(names, str):
-                names = [name]
+                names = [names]
+            data = layer_struct.data
             for name in names:
-                disp = lay.data[name]['display']
-                lay.data[name]['display'] = not disp
+                dstruct = data[name]
+                dstruct['display'] = not dstruct['display']
 
     def set_display(self, names, display, layer, figure=None):
         """
@@ -820,9 +1217,10 @@ class Plotter(object):
 
         assert display in [True, False]
         if isinstance(names, str):
-            names = [name]
+            names = [names]
+        data = lay.data
         for name in names:
-            lay.data[name]['display'] = display
+            data[name]['display'] = display
 
     def append_data(self, data, layer, name, figure=None, log=None):
         """
@@ -830,18 +1228,10 @@ class Plotter(object):
 
         display attribute of existing data will continue to apply.
         ISSUE: Doc string?
-        """
-        fig_struct, figure = self._resolve_fig(figure)
-        try:
-            lay = fig_struct.layers[layer]
-        except KeyError:
-            raise ValueError("Layer %s does not exist in figure %s"%(layer, figure))
-
-        try:
-            dataset = lay.data[name]
-        except KeyError:
-            raise ValueError("Dataset %s does not exist in layer" % name)
 
+        *data* is a single point, as a Point2D or an (x, y) pair. Use
+        append_data_batch to append many points at once.
+        """
         if isinstance(data, pp.Point2D):
             x = data.x
             y = data.y
@@ -853,14 +1243,67 @@ class Plotter(object):
             except:
                 raise TypeError("Point must be of type Point2D or iterable")
 
-        dataset['data'][0].append(x)
-        dataset['data'][1].append(y)
+        self.append_data_batch(([x], [y]), layer, name, figure=figure, log=log)
+
+    def append_data_batch(self, data, layer, name, figure=None, log=None):
+        """
+        Append a pair of sequences of x, y values (as for add_data) to the
+        given named data in the given layer.
+
+        Points are written into a preallocated buffer that doubles in
+        size when full, and the dataset's 'data' entry is a pair of views
+        onto it. The interpolated trajectory is only marked stale here and
+        is rebuilt when the layer's trajs are next read.
+        """
+        fig_struct, figure = self._resolve_fig(figure)
+        try:
+            lay = fig_struct.layers[layer]
+        except KeyError:
+            raise ValueError("Layer %s does not exist in figure %s"%(layer, figure))
+
+        try:
+            dataset = lay.data[name]
+        except KeyError:
+            raise ValueError("Dataset %s does not exist in layer" % name)
+
+        new_xs = np.asarray(data[0], dtype=float).ravel()
+        new_ys = np.asarray(data[1], dtype=float).ravel()
+        if len(new_xs) != len(new_ys):
+            raise ValueError("x and y data must have the same length")
+        k = len(new_xs)
+
+        xs, ys = dataset['data'][0], dataset['data'][1]
+        n = len(xs)
+        buf = dataset.get('buffer')
+        if buf is None or getattr(xs, 'base', None) is not buf or \
+           n + k > buf.shape[1]:
+            # (re)allocate: first append, data replaced elsewhere, or full
+            # (not max(): it may be numpy's, see force_line_to_extent)
+            size = 2*(n+k)
+            if size < 16:
+                size = 16
+            new_buf = np.empty((2, size))
+            new_buf[0, :n] = xs
+            new_buf[1, :n] = ys
+            buf = dataset['buffer'] = new_buf
+        buf[0, n:n+k] = new_xs
+        buf[1, n:n+k] = new_ys
+        dataset['data'] = [buf[0, :n+k], buf[1, :n+k]]
 
         if log:
             log.msg("Appended plot data", figure=figure, layer=layer,
                         name=name)
 
-        self._update_traj(layer, figure)
+        lay.stale_trajs.add(name)
+
+        try:
+            lay.handles[name].set_data(*dataset['data'])
+        except (KeyError, AttributeError):
+            # object not actually plotted yet, or not a line
+            pass
+        else:
+            if lay.dynamic:
+                self._blit_dynamic(figure)
 
 
     def add_line_by_points(self, pts, figure=None, layer=None, style=None,
@@ -889,7 +1332,8 @@ class Plotter(object):
     def add_vline(self, x, figure=None, layer=None, subplot=None, style=None, name='vline',
                  log=None):
         """
-        Add vertical line.
+        Add vertical line. *x* may also be a sequence of positions, which
+        are stored as a single NaN-separated dataset (one plot artist).
         """
         # ISSUE: Same issue as add_hline -- see below
         fig_struct, figure = self._resolve_fig(figure)
@@ -902,14 +1346,19 @@ class Plotter(object):
                 ydom = self.figs[figure].domain[1]
             else:
                 ydom = sc[1]
-        self.add_data([[x, x], ydom], figure=figure, layer=layer, subplot=subplot,
+        if np.ndim(x) == 0:
+            data = [[x, x], ydom]
+        else:
+            data = _line_set(x, ydom)[::-1]
+        self.add_data(data, figure=figure, layer=layer, subplot=subplot,
                          style=style, name=name, log=log)
 
 
     def add_hline(self, y, figure=None, layer=None, style=None, name='hline',
                  log=None):
         """
-        Add horizontal line.
+        Add horizontal line. *y* may also be a sequence of positions, which
+        are stored as a single NaN-separated dataset (one plot artist).
         """
         # ISSUE: This should be changed to use ax.axhline, which automatically
         # always spans the x axis with the default coords settings.
@@ -923,7 +1372,11 @@ class Plotter(object):
                 xdom = self.figs[figure].domain[0]
             else:
                 xdom = sc[0]
-        self.add_data([xdom, [y, y]], figure=figure, layer=layer,
+        if np.ndim(y) == 0:
+            data = [xdom, [y, y]]
+        else:
+            data = _line_set(y, xdom)
+        self.add_data(data, figure=figure, layer=layer,
                      style=style, name=name, log=log)
 
 
@@ -955,7 +1408,8 @@ class Plotter(object):
             name = get_unique_name(figure+'_'+layer)
 
         d.update({name: {'data': [x, y], 'text': text, 'display': display,
-                         'style': style, 'use_axis_coords': use_axis_coords, 'subplot': subplot}})
+                         'style': style, 'use_axis_coords': use_axis_coords, 'subplot': subplot,
+                         'dirty': True}})
 
         if log:
             log.msg("Added text data", figure=figure, layer=layer, name=name)
@@ -976,91 +1430,88 @@ class Plotter(object):
             pass
         if pos is not None:
             text_struct['data'] = pos
+        # picked up by build_layer on the next refresh
+        text_struct['dirty'] = True
 
 
     def _subplots(self, layers, fig_name, rebuild=False):
         fig_struct = self.figs[fig_name]
-        fig = plt.figure(fig_struct.fignum)
-        if rebuild:
+        fig = self._figure_window(fig_struct)
+        if rebuild and fig.get_axes():
+            widget_axes = [bttn.ax for bttn in self.gui.widgets.values()]
             for axs in fig.get_axes():
-                if axs not in [bttn.ax for bttn in self.gui.widgets.values()]:
+                if axs not in widget_axes:
                     fig.delaxes(axs)
 
-        # Build up each subplot, left to right, top to bottom
+        if not fig_struct.arrange:
+            # arrange is an empty list until arrange_fig is called
+            # (e.g. for shape=[1,1]): no sub-plots to build
+            return
+
+        # Build up each subplot, left to right, top to bottom, visiting
+        # only the arranged positions (arrange_fig checked they fit shape)
         shape = fig_struct.shape
-        for i in range(shape[0]):
-            for j in range(shape[1]):
-                ixstr = str(i+1) + str(j+1)
-                try:
-                    subplot_struct = fig_struct.arrange[ixstr]
-                except (KeyError, TypeError):
-                    # type error if arrange is empty list (e.g. for shape=[1,1])
-                    continue
-                layer_info = subplot_struct['layers']
-                if not isinstance(layer_info, list):
-                    if layer_info == '*':
-                        layer_info = list(fig_struct.layers.keys())
-                    else:
-                        # singleton string layer name
-                        layer_info = [layer_info]
+        for ixstr in sorted(fig_struct.arrange, key=_subplot_index):
+            i, j = _subplot_index(ixstr)
+            subplot_struct = fig_struct.arrange[ixstr]
+            layer_info = subplot_struct['layers']
+            if not isinstance(layer_info, list):
+                if layer_info == '*':
+                    layer_info = list(fig_struct.layers.keys())
+                else:
+                    # singleton string layer name
+                    layer_info = [layer_info]
+
+            try:
+                scale = subplot_struct['scale']
+            except KeyError:
+                subplot_struct['scale'] = None
+                scale = None
 
+            if rebuild:
+                #Check if projection type has been specified for layer.
                 try:
-                    scale = subplot_struct['scale']
+                    ax = fig.add_subplot(shape[0], shape[1], shape[1]*i + j+1, projection= subplot_struct['projection'])
                 except KeyError:
-                    subplot_struct['scale'] = None
-                    scale = None
+                    ax = fig.add_subplot(shape[0], shape[1], shape[1]*i + j+1)
 
-                if rebuild:
-                    #Check if projection type has been specified for layer.
-                    try:
-                        ax = fig.add_subplot(shape[0], shape[1], shape[1]*i + j+1, projection= subplot_struct['projection'])
-                    except KeyError:
-                        ax = fig.add_subplot(shape[0], shape[1], shape[1]*i + j+1)
+                subplot_struct['axes_obj'] = ax
+                ax.set_title(subplot_struct['name'])
+                axes_vars = subplot_struct['axes_vars']
+                ax.set_xlabel(axes_vars[0])
+                ax.set_ylabel(axes_vars[1])
 
-                    subplot_struct['axes_obj'] = ax
-                    ax.set_title(subplot_struct['name'])
-                    axes_vars = subplot_struct['axes_vars']
-                    ax.set_xlabel(axes_vars[0])
-                    ax.set_ylabel(axes_vars[1])
+                if len(axes_vars) == 3:
+                    if subplot_struct['projection'] != '3d':
+                        raise ValueError("Cannot have 3 axes variables on a layer where projection is not '3d'")
+                    ax.set_zlabel(axes_vars[2])
 
-                    if len(axes_vars) == 3:
-                        if subplot_struct['projection'] != '3d':
-                            raise ValueError("Cannot have 3 axes variables on a layer where projection is not '3d'")
-                        ax.set_zlabel(axes_vars[2])
+            else:
+                ax = subplot_struct['axes_obj']
 
-                else:
-                    ax = subplot_struct['axes_obj']
+            if 'callbacks' in subplot_struct:
+                if ax not in self.gui.cb_axes:
+                    self.gui.cb_axes.append(ax)
+                    self.gui.RS_boxes[ax] = RectangleSelector(ax, self.gui.onselect_box,
+                                                              drawtype= 'box')
+                    self.gui.RS_lines[ax] = RectangleSelector(ax, self.gui.onselect_line,
+                                                              drawtype='line')
+                    self.gui.RS_boxes[ax].set_active(False)
+                    self.gui.RS_lines[ax].set_active(False)
 
-                if 'callbacks' in subplot_struct:
-                    if ax not in self.gui.cb_axes:
-                        self.gui.cb_axes.append(ax)
-                        self.gui.RS_boxes[ax] = RectangleSelector(ax, self.gui.onselect_box,
-                                                                  drawtype= 'box')
-                        self.gui.RS_lines[ax] = RectangleSelector(ax, self.gui.onselect_line,
-                                                                  drawtype='line')
-                        self.gui.RS_boxes[ax].set_active(False)
-                        self.gui.RS_lines[ax].set_active(False)
-
-                if 'legend' in subplot_struct:
-                    handles = subplot_struct['legend']
-                    subplot_struct['axes_obj'].legend(handles= handles)
-
-                # refresh this in case layer contents have changed
-                self.subplot_lookup[ax] = (fig_name, layer_info, ixstr)
-
-                # ISSUE: these should be built into Plotter's figure domains instead
-                if scale is not None:
-                    # scale may be [None, None], [None, [ylo, yhi]], etc.
-                    try:
-                        ax.set_xlim(scale[0])
-                    except TypeError:
-                        pass
-                    try:
-                        ax.set_ylim(scale[1])
-                    except TypeError:
-                        pass
+            if 'legend' in subplot_struct:
+                handles = subplot_struct['legend']
+                subplot_struct['axes_obj'].legend(handles= handles)
+
+            # refresh this in case layer contents have changed
+            self.subplot_lookup[ax] = (fig_name, layer_info, ixstr)
 
-                self.build_layers(layer_info, ax, rebuild=rebuild, figure=fig_name)
+            # ISSUE: these should be built into Plotter's figure domains instead
+            # The sub-plot's scale overrides its layers' scales, so pass it
+            # down rather than letting each layer set limits that show()
+            # then resets (which also marks the figure stale on every call).
+            self.build_layers(layer_info, ax, rescale=scale, rebuild=rebuild,
+                              figure=fig_name)
 
 
     def show(self, update='current', rebuild=False, force_wait=None, ignore_wait= False):
@@ -1093,16 +1544,25 @@ class Plotter(object):
         if update is not None:
             for fig_name in figures:
                 self._subplots(layers[fig_name], fig_name, rebuild)
-        # ISSUE: should consolidate this with layer.scale attribute
-        # and move all to build_layer method?
         for figName, fig in self.figs.items():
-            f = plt.figure(fig.fignum)
-            for pos in fig.arrange.keys():
-                ax = fig.arrange[pos]['axes_obj']
-                xdom, ydom = fig.arrange[pos]['scale']
-                ax.set_xlim(xdom)
-                ax.set_ylim(ydom)
-            f.canvas.draw()
+            f = self._figure_window(fig)
+            # Sub-plot scales are applied here only, once per refresh
+            # (arrange is an empty list for figures never arranged)
+            for subplot_struct in (fig.arrange or {}).values():
+                _set_lims(subplot_struct['axes_obj'], subplot_struct.get('scale'))
+            if fig.fignum not in self._draw_cids:
+                self._draw_cids[fig.fignum] = f.canvas.mpl_connect('draw_event',
+                                lambda ev, name=figName: self._cache_background(name))
+            # Artists of dynamic layers are animated and don't mark the figure
+            # stale when changed, so if nothing else changed since the last
+            # draw, only the dynamic layers need to be blitted. Full redraws
+            # are left to the event loop, so back-to-back show() calls (e.g.
+            # from several line_GUI.show) paint once; the draw_event
+            # then re-caches the backgrounds.
+            if rebuild or f.stale or fig.fignum not in self._bg_cache:
+                self._redraw(figName, full=True)
+            else:
+                self._blit_dynamic(figName)
         if not self.shown:
             # TEMP
             plt.ion() #Artists not appearing on axes without call to ion
@@ -1157,28 +1617,156 @@ class Plotter(object):
             return
 
         for layer_name in layer_list:
-            self.build_layer(figure, layer_name, ax, rescale, force=(rebuild or
-                                                                    fig_struct['layers'][layer_name].force))
+            lay = fig_struct['layers'][layer_name]
+            force = rebuild or lay.force
+            if lay.force and not rebuild:
+                # skip a forced rebuild (e.g. data re-added with force=True)
+                # if the layer's content is unchanged since last built
+                sig = _layer_signature(lay)
+                if sig == lay.drawn_sig and lay.handles:
+                    force = lay.force = False
+                lay.drawn_sig = sig
+            self.build_layer(figure, layer_name, ax, rescale, force=force)
+
+
+    def _figure_window(self, fig_struct):
+        """
+        Internal utility to return the matplotlib figure of a figure
+        structure, creating it on first use. The figure is kept in the
+        structure's window attribute, so pyplot's registry is only asked
+        whether it is still open (unlike plt.figure, this doesn't make it
+        pyplot's current figure either).
+        """
+        f = fig_struct.window
+        if f is None or not plt.fignum_exists(fig_struct.fignum):
+            f = fig_struct.window = plt.figure(fig_struct.fignum)
+        return f
+
+    def _mpl_fig(self, fig_struct):
+        """
+        Internal utility to return the matplotlib figure of a figure
+        structure via its sub-plot axes, without plt.figure (which would
+        also make it pyplot's current figure). None if no axes are built yet.
+        """
+        try:
+            for subplot_struct in fig_struct.arrange.values():
+                return subplot_struct['axes_obj'].figure
+        except (AttributeError, KeyError):
+            # arrange may be an empty list
+            pass
+        return None
 
+    def _dynamic_handles(self, fig_struct, ax):
+        """
+        Internal utility to list the artists of dynamic layers drawn in ax,
+        including the GUI's time lines.
+        """
+        hs = [h for lay in fig_struct.layers.values() if lay.dynamic
+              for h in lay.handles.values() if h.axes is ax]
+        gui = getattr(self, 'gui', None)
+        if gui is not None:
+            hs.extend([l for l in gui.timeLines if l.axes is ax])
+        return hs
+
+    def _cache_background(self, figure):
+        """
+        draw_event callback: store each axes' background (dynamic layers'
+        artists are animated, so not part of it) and draw the dynamic
+        artists on top.
+        """
+        fig_struct = self.figs[figure]
+        f = self._mpl_fig(fig_struct)
+        if f is None or not getattr(f.canvas, 'supports_blit', False):
+            return
+        bgs = {}
+        for pos, subplot_struct in fig_struct.arrange.items():
+            ax = subplot_struct['axes_obj']
+            bgs[pos] = f.canvas.copy_from_bbox(ax.bbox)
+            for h in self._dynamic_handles(fig_struct, ax):
+                ax.draw_artist(h)
+        self._bg_cache[fig_struct.fignum] = bgs
+
+    def _blit_dynamic(self, figure):
+        """
+        Redraw only the dynamic layers of the figure over the cached
+        backgrounds. Falls back to an idle full redraw if no background
+        has been cached yet (or the backend can't blit).
+        """
+        if self._batch_depth:
+            self._redraw(figure)
+            return
+        fig_struct = self.figs[figure]
+        f = self._mpl_fig(fig_struct)
+        if f is None:
+            return
+        bgs = self._bg_cache.get(fig_struct.fignum)
+        # (the star import from PyDSTool shadows the builtin any)
+        if not bgs or not set(fig_struct.arrange) <= set(bgs):
+            f.canvas.draw_idle()
+            return
+        for pos, subplot_struct in fig_struct.arrange.items():
+            ax = subplot_struct['axes_obj']
+            f.canvas.restore_region(bgs[pos])
+            for h in self._dynamic_handles(fig_struct, ax):
+                ax.draw_artist(h)
+            f.canvas.blit(ax.bbox)
+
+    def _redraw(self, figure, full=False):
+        """
+        Internal utility to redraw the figure: fully (as an idle draw) or
+        by blitting its dynamic layers. Inside a _batch_updates block this
+        is deferred until the outermost block exits.
+        """
+        if self._batch_depth:
+            self._deferred_draws[figure] = \
+                self._deferred_draws.get(figure, False) or full
+        elif full:
+            fig_struct = self.figs[figure]
+            f = fig_struct.window
+            # (a figure closed meanwhile is left closed)
+            if f is not None and plt.fignum_exists(fig_struct.fignum):
+                f.canvas.draw_idle()
+        else:
+            self._blit_dynamic(figure)
+
+    @contextmanager
+    def _batch_updates(self):
+        """
+        Context manager deferring all figure redraws made by show(),
+        _blit_dynamic etc. within it, so that each affected figure is
+        redrawn once on exit. Blocks may be nested.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                deferred, self._deferred_draws = self._deferred_draws, {}
+                for figure, full in deferred.items():
+                    if figure not in self.figs:
+                        continue
+                    f = self.figs[figure].window
+                    # artists other than dynamic ones changed after the
+                    # redraw was requested
+                    self._redraw(figure, full or (f is not None and f.stale))
 
     def update_dynamic(self, time, dynamicFns, hard_reset=False):
         """
         Dynamic callback functions always accept time as first argument.
         Optional second argument is hard_reset Boolean.
         """
-        for figName in self.figs:
-            for layer in self.figs[figName].layers:
-                argsLayer = self.figs[figName].layers[layer]
-
-                if not argsLayer.dynamic:
-                    continue
-                else:
-                    assert isinstance(dynamicFns, dict), \
-                           "Dynamic functions must be a dictionary of layer-function pairs"
-
-                    if layer in dynamicFns:
-                        #print("update_dynamic calling function: %s" % str(dynamicFns[layer]))
-                        dynamicFns[layer](time, hard_reset)
+        assert isinstance(dynamicFns, dict), \
+               "Dynamic functions must be a dictionary of layer-function pairs"
+        # only layers with a function can need updating, so look those up
+        # rather than scanning every layer of every figure
+        for fig_struct in self.figs.values():
+            layers = fig_struct.layers
+            for layer, fn in dynamicFns.items():
+                argsLayer = layers.get(layer)
+                if argsLayer is not None and argsLayer.dynamic:
+                    #print("update_dynamic calling function: %s" % str(fn))
+                    fn(time, hard_reset)
 
 
     def _resolve_fig(self, figure):
@@ -1186,10 +1774,10 @@ class Plotter(object):
         Internal utility to return a figure structure and figure name,
         given that the figure argument may be None (selecting the current figure)
         """
-        if figure is None and self.currFig is None:
-            raise ValueError("Must set current figure")
-        elif figure is None and self.currFig is not None:
+        if figure is None:
             figure = self.currFig
+            if figure is None:
+                raise ValueError("Must set current figure")
 
         try:
             fig_struct = self.figs[figure]
@@ -1213,6 +1801,61 @@ class Plotter(object):
         except KeyError:
             raise KeyError("Invalid layer name: %s in figure %s" % (layer, figure))
 
+    def _build_batches(self, lay, ax, subplot, datasets, force=False):
+        """
+        Internal utility for build_layer on batched layers: draws the 2D
+        datasets of one sub-plot that have a style string as one
+        NaN-separated Line2D per style (taking line width, marker size
+        and zorder from the first dataset of each), so a layer of many
+        similar curves costs one artist per style rather than one per curve.
+        Batch lines are only replotted when their datasets have changed.
+        Returns the remaining (dname, dstruct) pairs, to be drawn as usual.
+        """
+        batches = OrderedDict()
+        rest = []
+        for dname, dstruct in datasets:
+            style = dstruct['style']
+            if style is None or (isinstance(style, str) and style == ""):
+                # default to black lines, as in build_layer
+                style = 'k-'
+            if isinstance(style, str) and len(dstruct['data']) == 2 and \
+               not isinstance(dstruct['data'], mpl.artist.Artist):
+                batches.setdefault(style, []).append((dname, dstruct))
+            else:
+                rest.append((dname, dstruct))
+
+        prefix = '_batch_%s_' % (subplot,)
+        for bname in [h for h in lay.handles if h.startswith(prefix)]:
+            if bname[len(prefix):] not in batches:
+                # no datasets of this style left
+                lay.handles.pop(bname).remove()
+                del lay.batch_state[bname]
+
+        for style, members in batches.items():
+            bname = prefix + style
+            state = [(dname, dstruct['display']) for dname, dstruct in members]
+            changed = [dname for dname, dstruct in members if dstruct.get('dirty', True)]
+            if bname in lay.handles and not force and not changed and \
+               lay.batch_state[bname] == state:
+                continue
+            if bname in lay.handles:
+                lay.handles.pop(bname).remove()
+            shown = [dstruct['data'] for dname, dstruct in members if dstruct['display']]
+            nan = [np.nan]
+            xs = np.concatenate([c for d in shown for c in (d[0], nan)][:-1] or [nan])
+            ys = np.concatenate([c for d in shown for c in (d[1], nan)][:-1] or [nan])
+            first = members[0][1]
+            lay.handles[bname] = ax.plot(xs, ys, linewidth=first['linewidth'],
+                                         zorder=first['zorder'],
+                                         markersize=first['markersize'],
+                                         **_parse_style(style))[0]
+            lay.handles[bname].set_picker(2.5)
+            lay.batch_state[bname] = state
+            for dname, dstruct in members:
+                dstruct['dirty'] = False
+        lay.force = False
+        return rest
+
     def _retrieve_subplots(self, layer, figure=None):
         """
         Internal utility to find all subplots a given layer has been assigned to through arrange_fig.
@@ -1221,11 +1864,15 @@ class Plotter(object):
         if not figure:
             figure = self.currFig
         for sp, dic in self.figs[figure]['arrange'].items():
-            if dic['layers'] is '*':
+            layer_info = dic['layers']
+            if layer_info == '*':
                 subplots = list(self.figs[figure]['arrange'].keys())
                 break
 
-            if layer in dic['layers']:
+            if isinstance(layer_info, str):
+                # singleton layer name (not a substring test)
+                layer_info = [layer_info]
+            if layer in layer_info:
                 subplots += [sp]
 
         return subplots
@@ -1238,6 +1885,9 @@ class Plotter(object):
            should be preserved, overriding the layer's set scale, if any
 
         Optional force = True argument will rebuild plot object handles.
+
+        Nothing is drawn here: callers make all their updates and then
+        draw once (e.g. with show()), so several changes share one redraw.
         """
         fig_struct = self.figs[figure_name]
         if not fig_struct.display:
@@ -1247,7 +1897,8 @@ class Plotter(object):
         if not lay.display:
             # switch off visibility of all object handles
             for obj in lay.handles.values():
-                obj.set_visible(False)
+                if obj.get_visible():
+                    obj.set_visible(False)
             return
 
         ##ISSUE: This is very finnicky. Should find more reliable way to clear artists in matplotlib axes.
@@ -1262,157 +1913,203 @@ class Plotter(object):
 
             lay.handles = OrderedDict({})
 
-        ##ISSUE: Would be preferable to only do this if we know these fields have been changed.
+        # Setters are only called for values that differ, as set_zorder,
+        # set_color and set_visible mark the figure stale unconditionally,
+        # which would force a full redraw in show().
         for hname, handle in lay.handles.items():
             ##ISSUE: Sometimes an hname isn't in the lay.data. Should not have to use a try except here.
             try:
-                handle.set_linewidth(lay.data[hname]['linewidth'])
-                handle.set_markersize(lay.data[hname]['markersize'])
-                handle.set_zorder(lay.data[hname]['zorder'])
-                handle.set_color(lay.data[hname]['style'][0])
-            except (KeyError, AttributeError) as e:
+                hstruct = lay.data[hname]
+                if not hstruct['display']:
+                    # hidden: nothing to restyle
+                    continue
+                handle.set_linewidth(hstruct['linewidth'])
+                handle.set_markersize(hstruct['markersize'])
+                if handle.get_zorder() != hstruct['zorder']:
+                    handle.set_zorder(hstruct['zorder'])
+                color = _style_color(hstruct['style'])
+                if color is not None and \
+                   mpl.colors.to_rgba(handle.get_color()) != mpl.colors.to_rgba(color):
+                    handle.set_color(color)
+            except (KeyError, AttributeError, ValueError) as e:
                 pass
 
-        for dname, dstruct in lay.data.items():
-            # we should have a way to know if the layer contains points
-            # that may or may not already be updated *in place* and therefore
-            # don't need to be redrawn
-
-            ##ISSUE: This block doesn't seem to do anything.
-            try:
-                obj = lay.handles[dname]
-            except KeyError:
-                # object not actually plotted yet
-                pass
-            else:
-                obj.set_visible(dstruct['display'])
+        # per-layer lookups, hoisted out of the per-dataset loop
+        arrange = fig_struct.arrange
+        default_subplot = None
 
+        # group datasets by sub-plot so that each axes object is looked up once
+        by_subplot = OrderedDict()
+        for dname, dstruct in lay.data.items():
             # For now, default to first subplot with 0 indexing if multiple exist
-            if dstruct['subplot'] == None:
-                dstruct['subplot'] = self._retrieve_subplots(layer_name, figure=figure_name)[0]
+            if dstruct['subplot'] is None:
+                if default_subplot is None:
+                    default_subplot = self._retrieve_subplots(layer_name, figure=figure_name)[0]
+                dstruct['subplot'] = default_subplot
+            by_subplot.setdefault(dstruct['subplot'], []).append((dname, dstruct))
 
+        for subplot, datasets in by_subplot.items():
             #Use subplot string for current data to retrieve the axes object.
-            ax = self.figs[figure_name].arrange[dstruct['subplot']]['axes_obj']
+            ax = arrange[subplot]['axes_obj']
 
-            try:
-                # process user-defined style, which can be a string, a dict, or an array
-                # in the case of a continuous colormap
-                style = dstruct['style']
-            except KeyError:
-                style = None
-            if style is None or (isinstance(style, str) and style == ""):
-                # default to black lines
-                style = 'k-'
+            if lay.kind == 'data' and lay.batched:
+                # leaves only the datasets that can't share a line
+                datasets = self._build_batches(lay, ax, subplot, datasets, force)
 
-            # in case in future we wish to have option to reverse axes
-            ix0, ix1, ix2 = 0, 1, 2
+            for dname, dstruct in datasets:
+                # we should have a way to know if the layer contains points
+                # that may or may not already be updated *in place* and therefore
+                # don't need to be redrawn
 
-            #if dstruct['selected']:
-                #linewidth = 2.5
-                #markersize = 12
-            #else:
-                #linewidth = 1
-                #markersize = 6
-
-            if lay.kind == 'text' and dstruct['display']:
-                ##ISSUE: These probably just need to be "if dname not in handles:", since force = True
-                ## will clear lay.handles anyways.
-                if dname not in lay.handles or force:
-                    if dstruct['use_axis_coords']:
-                        lay.handles[dname] = ax.text(dstruct['data'][ix0],
-                             dstruct['data'][ix1],
-                             dstruct['text'],
-                             transform=ax.transAxes,
-                             fontsize=20, color=s[0])
-                    else:
-                        # ISSUE: ASSUME style string is color character first, then symbol character
-                        lay.handles[dname] = ax.text(dstruct['data'][ix0],
-                             dstruct['data'][ix1],
-                             dstruct['text'],
-                             fontsize=20, color=style[0])
-
-            elif lay.kind == 'patch':
-                pos = dstruct['data']
-                for i in range(len(pos[0])):
-                    #This must generalize to other patches.
-                    lay.handles[dname] = ax.add_artist(dstruct['patch']((pos[0][i], pos[1][i]),
-                                  dstruct['radius'][i],
-                                  color = dstruct['color'],
-                                  visible = dstruct['display']))
-
-            elif lay.kind == 'obj':
-                coords = dstruct['data']
-                try: #Line
-                    l = dstruct['obj'](coords[0], coords[1], linewidth=dstruct['linewidth'],
-                                       color='y', visible=dstruct['display'])
-                except TypeError: #Rectangle
-                    l = dstruct['obj'](coords[0], coords[1][0], coords[1][1],
-                                       linewidth=dstruct['linewidth'], color='y',
-                                       visible=dstruct['display'], fill=False)
-                ##ISSUE: try/except not needed here.
+                ##ISSUE: This block doesn't seem to do anything.
                 try:
-                    self.gui.context_objects[dname].handle = l
-                    lay.handles[dname] = ax.add_artist(l)
-                    lay.handles[dname].set_picker(2.5)  # ISSUE: Why?
+                    obj = lay.handles[dname]
                 except KeyError:
+                    # object not actually plotted yet
                     pass
+                else:
+                    if obj.get_visible() != dstruct['display']:
+                        obj.set_visible(dstruct['display'])
+                    if lay.kind == 'text' and not dstruct.get('dirty', True):
+                        # unchanged text artist: nothing else to do
+                        continue
+
+                try:
+                    # process user-defined style, which can be a string, a dict, or an array
+                    # in the case of a continuous colormap
+                    style = dstruct['style']
+                except KeyError:
+                    style = None
+                if style is None or (isinstance(style, str) and style == ""):
+                    # default to black lines
+                    style = 'k-'
+
+                # in case in future we wish to have option to reverse axes
+                ix0, ix1, ix2 = 0, 1, 2
 
-            elif lay.kind == 'data':
-                if dname not in lay.handles or force:
+                #if dstruct['selected']:
+                    #linewidth = 2.5
+                    #markersize = 12
+                #else:
+                    #linewidth = 1
+                    #markersize = 6
+
+                if lay.kind == 'text' and dstruct['display']:
+                    # text artists are reused; only refresh them after add_text
+                    # or set_text has marked the entry dirty
+                    x, y = dstruct['data'][ix0], dstruct['data'][ix1]
+                    if dname not in lay.handles:
+                        if dstruct['use_axis_coords']:
+                            transform = ax.transAxes
+                        else:
+                            transform = ax.transData
+                        # ISSUE: ASSUME style string is color character first, then symbol character
+                        lay.handles[dname] = ax.text(x, y, dstruct['text'],
+                                                     transform=transform,
+                                                     fontsize=20, color=style[0])
+                    elif dstruct.get('dirty', True):
+                        lay.handles[dname].set_text(dstruct['text'])
+                        lay.handles[dname].set_position((x, y))
+                    dstruct['dirty'] = False
+
+                elif lay.kind == 'patch':
+                    if dname not in lay.handles or force:
+                        pos = dstruct['data']
+                        # one collection artist per dataset rather than one
+                        # artist per patch; color may also be one per patch
+                        if dstruct['patch'] is plt.Circle:
+                            # built straight from the arrays, no Circle objects
+                            lay.handles[dname] = ax.add_collection(
+                                _circle_collection(ax, pos, dstruct['radius'],
+                                                   color=dstruct['color'],
+                                                   visible=dstruct['display']))
+                        else:
+                            #This must generalize to other patches.
+                            patches = [dstruct['patch']((pos[0][i], pos[1][i]),
+                                                        dstruct['radius'][i])
+                                       for i in range(len(pos[0]))]
+                            lay.handles[dname] = ax.add_collection(
+                                mpl.collections.PatchCollection(patches, color=dstruct['color'],
+                                                visible=dstruct['display']))
+
+                elif lay.kind == 'obj':
+                    coords = dstruct['data']
+                    try: #Line
+                        l = dstruct['obj'](coords[0], coords[1], linewidth=dstruct['linewidth'],
+                                           color='y', visible=dstruct['display'])
+                    except TypeError: #Rectangle
+                        l = dstruct['obj'](coords[0], coords[1][0], coords[1][1],
+                                           linewidth=dstruct['linewidth'], color='y',
+                                           visible=dstruct['display'], fill=False)
+                    ##ISSUE: try/except not needed here.
                     try:
-                        # if this works, style is never used
-                        lay.handles[dname] = ax.add_collection(dstruct['data'])
-                    except AttributeError:
-                        if isinstance(style, str):
-                            #Check if data are two or three dimensional.
-                            if len(dstruct['data']) == 2:
-                                ##ISSUE: Should repeat changes made to this case (i.e., setting the picker and new dstruct properties)
-                                ## to the other cases. At least the other 2d case.
-                                ## style_as_string == False is a potential landmine.
-                                lay.handles[dname] = \
-                                    ax.plot(dstruct['data'][ix0], dstruct['data'][ix1],
-                                            style, linewidth= dstruct['linewidth'],
-                                            zorder = dstruct['zorder'], markersize = dstruct['markersize'],
-                                            visible= dstruct['display'])[0]
-                                #ax.add_artist(lay.handles[dname])
-                                lay.handles[dname].set_picker(2.5)
-
-                            elif len(dstruct['data']) == 3:
-                                lay.handles[dname] = \
-                                    ax.plot(dstruct['data'][ix0], dstruct['data'][ix1], dstruct['data'][ix2],
-                                            style, visible= dstruct['display'])[0]
-                        elif isinstance(style, dict):
-                            #Display? Visibility?
-                            if len(dstruct['data']) == 2:
-                                lay.handles[dname] = \
-                                    ax.plot(dstruct['data'][ix0], dstruct['data'][ix1],
-                                            **style)[0]
-                                #ax.add_artist(lay.handles[dname])
-                                lay.handles[dname].set_picker(True)
-                            elif len(dstruct['data']) == 3:
-                                lay.handles[dname] = \
-                                    ax.plot(dstruct['data'][ix0], dstruct['data'][ix1], dstruct['data'][ix2],
-                                            **style)[0]
-                        #else:  # Never get here because try clause would have worked
-                    #ax.add_artist(lay.handles[dname])
-                    lay.force = False
-
-        if rescale is not None:
-            # overrides layer scale
-            sc = rescale
-        elif lay.scale is not None:
-            sc = lay.scale
-        else:
-            sc = None
-        if sc is not None:
-            try:
-                ax.set_xlim(sc[0])
-            except TypeError:
-                pass
-            try:
-                ax.set_ylim(sc[1])
-            except TypeError:
-                pass
+                        self.gui.context_objects[dname].handle = l
+                        lay.handles[dname] = ax.add_artist(l)
+                        lay.handles[dname].set_picker(2.5)  # ISSUE: Why?
+                    except KeyError:
+                        pass
+
+                elif lay.kind == 'data':
+                    handle = lay.handles.get(dname)
+                    if handle is not None and not force and handle.axes is not ax:
+                        # dataset moved to another sub-plot: plot it afresh
+                        handle.remove()
+                        del lay.handles[dname]
+                    if dname not in lay.handles or force:
+                        try:
+                            # if this works, style is never used
+                            lay.handles[dname] = ax.add_collection(dstruct['data'])
+                        except AttributeError:
+                            if isinstance(style, str):
+                                #Check if data are two or three dimensional.
+                                if len(dstruct['data']) == 2:
+                                    ##ISSUE: Should repeat changes made to this case (i.e., setting the picker and new dstruct properties)
+                                    ## to the other cases. At least the other 2d case.
+                                    ## style_as_string == False is a potential landmine.
+                                    lay.handles[dname] = \
+                                        ax.plot(dstruct['data'][ix0], dstruct['data'][ix1],
+                                                linewidth= dstruct['linewidth'],
+                                                zorder = dstruct['zorder'], markersize = dstruct['markersize'],
+                                                visible= dstruct['display'], **_parse_style(style))[0]
+                                    #ax.add_artist(lay.handles[dname])
+                                    lay.handles[dname].set_picker(2.5)
+
+                                elif len(dstruct['data']) == 3:
+                                    lay.handles[dname] = \
+                                        ax.plot(dstruct['data'][ix0], dstruct['data'][ix1], dstruct['data'][ix2],
+                                                visible= dstruct['display'], **_parse_style(style))[0]
+                            elif isinstance(style, dict):
+                                #Display? Visibility?
+                                if len(dstruct['data']) == 2:
+                                    lay.handles[dname] = \
+                                        ax.plot(dstruct['data'][ix0], dstruct['data'][ix1],
+                                                **style)[0]
+                                    #ax.add_artist(lay.handles[dname])
+                                    lay.handles[dname].set_picker(True)
+                                elif len(dstruct['data']) == 3:
+                                    lay.handles[dname] = \
+                                        ax.plot(dstruct['data'][ix0], dstruct['data'][ix1], dstruct['data'][ix2],
+                                                **style)[0]
+                            #else:  # Never get here because try clause would have worked
+                        #ax.add_artist(lay.handles[dname])
+                        lay.force = False
+                    elif dstruct.get('dirty', True) and isinstance(handle, mpl.lines.Line2D):
+                        # new arrays for an existing line (see add_data)
+                        handle.set_data(dstruct['data'][ix0], dstruct['data'][ix1])
+                        if len(dstruct['data']) == 3:
+                            handle.set_3d_properties(dstruct['data'][ix2])
+                    dstruct['dirty'] = False
+
+        # dynamic layers are left out of full redraws and blitted instead
+        # (only where the canvas can blit, or they would never be drawn)
+        for h in lay.handles.values():
+            h.set_animated(lay.dynamic and h.figure is not None and
+                           getattr(h.figure.canvas, 'supports_blit', False))
+
+        # rescale overrides the layer scale, per axis
+        sc = [lay_dom if dom is None else dom for dom, lay_dom in
+              zip(rescale or (None, None), lay.scale or (None, None))]
+        _set_lims(ax, sc)
 
 
 class diagnosticGUI(object):
@@ -1434,8 +2131,11 @@ class diagnosticGUI(object):
         self.points = None
         # ISSUE: add Trajectory object too?
 
-        # times is an array from trajectory points
+        # times is an array from trajectory points (see _store_times)
         self.times = None
+        self._times_sorted = True
+        # set while set_time moves the time bar (see _on_time_bar_changed)
+        self._in_set_time = False
 
         # clipboard for a point selected in a dynamic sub-plot (e.g., phaseplane)
         self.clipboardPt = None
@@ -1466,9 +2166,18 @@ class diagnosticGUI(object):
         # masterWin is the figure handle for main GUI window
         self.masterWin = None
 
+        # upper end of the colormap used to color-code trajectories by speed
+        ##ISSUE: This should be replaced with something general purpose. Borrowed from Bombardier.
+        self.maxspeed = 2.2
+        # RGBA arrays already mapped by _speed_colors, most recent last
+        self._rgba_cache = OrderedDict()
+
         # default: does not expect time-parameterized trajectories
         # in main window
         self._with_times = False
+        # single-shot timer coalescing time bar changes (see build_plotter)
+        self._time_bar_timer = None
+        self._pending_t = None
 
         self.timePlots = []
         self.timeLines = []
@@ -1477,15 +2186,22 @@ class diagnosticGUI(object):
         self.plotter.gui = self
 
         self.widgets = {}
+        # axes of all widgets, for mouse_up's per-click test
+        self._widget_axes = set()
 
         # callback functions for dynamic plots indexed by layer name
         self.dynamicPlotFns = {}
 
         # axes objects for dynamic plots indexed by layer name
         self.dynamicPlots = {}
+        # the same axes, as a set for mouse_up's per-click lookup
+        self._dynamic_axes = set()
 
         self._mouseUp = True
         self._mouseDrag = False
+        # (canvas, id) of the motion callback, connected only while a
+        # button is down
+        self._move_cid = None
         self._key_mod = None
         # key modifiers for +/- dt control
         self._key_mod_dix = {None: 5,
@@ -1506,8 +2222,13 @@ class diagnosticGUI(object):
         self.calc_context = None
 
         self.last_output = None
+        # id(traj) -> (traj, sampled points, cKDTree) for mouse_event_snap
+        self._snap_trees = {}
 
         self.mouse_wait_state_owner = None
+        # connection id of the callback waiting for a mouse release
+        # (see _connect_mouse)
+        self.mouse_cid = None
 
         ##Handled in plotter2d._subplots
         #self.RS_line = RectangleSelector(self.ax, self.onselect_line, drawtype='line')
@@ -1531,21 +2252,54 @@ class diagnosticGUI(object):
         # ISSUE: This structure assumes time-dependent data only
         #  (not sufficiently general purpose)
         self.traj = traj
+        self._rgba_cache.clear()
         if points is None:
             self.points = traj.sample()
         else:
             self.points = points
         try:
-            self.times = self.points['t']
+            self._store_times(self.points['t'])
         except KeyError:
             # trajectory is not parameterized by 't'
+            self._store_times(None)
+
+    def _store_times(self, times):
+        """
+        Internal utility to set the times array searched by set_time on
+        every time change. It is converted and checked for monotonicity
+        only once, here.
+        """
+        if times is None:
             self.times = None
+            self._times_sorted = True
+            return
+        self.times = np.ascontiguousarray(times, dtype=float)
+        self._times_sorted = bool((np.diff(self.times) >= 0).all())
+
+    def _speed_colors(self, vals):
+        """
+        RGBA colors for an array of speeds, scaled to [0, self.maxspeed].
+        Results are memoized on the array's contents, so redrawing a
+        static trajectory does not map its colors again.
+        """
+        vals = np.ascontiguousarray(vals, dtype=float)
+        key = (hashlib.sha1(vals.tobytes()).digest(), vals.shape, self.maxspeed)
+        try:
+            rgba = self._rgba_cache[key]
+        except KeyError:
+            rgba = _lut_colors(vals, self.maxspeed)
+            # shared between datasets with the same speeds
+            rgba.flags.writeable = False
+            self._rgba_cache[key] = rgba
+            if len(self._rgba_cache) > _RGBA_CACHE_SIZE:
+                self._rgba_cache.popitem(last=False)
+        else:
+            self._rgba_cache.move_to_end(key)
+        return rgba
 
     def add_data_points(self, data, figure=None, layer=None, subplot=None,
                            style=None, linewidth = 1, name=None, display=True,
                            force=False, log=None, coorddict=None):
-        maxspeed = 2.2 #ISSUE: This should be replaced with something general purpose. Borrowed from Bombardier.
-
         try:
             fig_struct, figure = self.plotter._resolve_fig(None)
         except ValueError:
@@ -1569,134 +2323,86 @@ class diagnosticGUI(object):
                 addingDict = {}
 
                 for key, val in coorddict.items():
-                    #Extract x and y data.
-                    try:
-                        xs = data[val.get('x')]
-                    except (IndexError, StopIteration) as e:
-                        try:
-                            del xs
-                        except UnboundLocalError:
-                            pass
-
-                    try:
-                        ys = data[val.get('y')]
-                    except (IndexError, StopIteration) as e:
-                        try:
-                            del ys
-                        except UnboundLocalError:
-                            pass
-
-                    if not key in addingDict.keys() and ('xs' in locals() or 'ys' in locals()):
-                        addingDict[key] = {}
-
-                    try:
-                        addingDict[key]['data'] = [xs, ys]
-
-                    #If only x/y provided, use key data for other coordinate.
-                    except NameError:
-                        try:
-                            addingDict[key]['data'] = [xs, data[key]]
-                        except UnboundLocalError:
-                            pass
-                        try:
-                            addingDict[key]['data'] = [data[key], ys]
-                        except UnboundLocalError as e:
-                            pass
+                    #Extract x and y data (None if not specified).
+                    xs = data[val['x']] if 'x' in val else None
+                    ys = data[val['y']] if 'y' in val else None
+
+                    if xs is not None or ys is not None:
+                        entry = addingDict.setdefault(key, {})
+                        #If only x/y provided, use key data for other coordinate.
+                        if ys is None:
+                            entry['data'] = [xs, data[key]]
+                        elif xs is None:
+                            entry['data'] = [data[key], ys]
+                        else:
+                            entry['data'] = [xs, ys]
 
                     #Extract object
                     if val.get('object') == 'collection':
-                        addingDict[key]['segments'] = [( (xs[i], ys[i]), (xs[i+1], ys[i+1]) ) for i in range(len(xs)-1)]
+                        # (N-1, 2, 2) array of consecutive point pairs
+                        pts = np.column_stack((xs, ys))
+                        addingDict[key]['segments'] = np.stack((pts[:-1], pts[1:]), axis=1)
                     elif val.get('object') == 'circle':
                         addingDict[key]['patch'] = plt.Circle
 
-                    #Extract style
-                    try:
-                        addingDict[key]['style'] = val['style']
-                    except KeyError:
-                        pass
-
                     #Extract layer
-                    try:
-                        if val['layer'] not in fig_struct.layers.keys():
-                            self.plotter.add_layer(val['layer'])
-                            print("Added new layer %s to plotter."%val['layer'])
-                        addingDict[key]['layer'] = val['layer']
-                    except KeyError:
-                        pass
+                    if 'layer' in val and val['layer'] not in fig_struct.layers:
+                        self.plotter.add_layer(val['layer'])
+                        print("Added new layer %s to plotter."%val['layer'])
 
-                    #Extract name
-                    try:
-                        addingDict[key]['name'] = val['name']
-                    except KeyError:
-                        pass
+                    #Extract style, layer and name (for plotted keys only)
+                    if key in addingDict:
+                        for field in ('style', 'layer', 'name'):
+                            if field in val:
+                                addingDict[key][field] = val[field]
 
                     #Extract radii
-                    try:
-                        addingDict[val['map_radius_to']]['radius'] = data[key]
-                    except:
-                        try:
-                            addingDict[val['map_radius_to']] = {}
-                            addingDict[val['map_radius_to']]['radius'] = data[key]
-                        except KeyError:
-                            pass
+                    if 'map_radius_to' in val:
+                        addingDict.setdefault(val['map_radius_to'], {})['radius'] = data[key]
 
                     #Perform color mapping
-                    try:
-                        vals = data[key]
-                        norm = mpl.colors.Normalize(vmin=0, vmax=maxspeed)
-                        cmap=plt.cm.jet #gist_heat
-                        try:
-                            addingDict[val['map_color_to']]['style'] = cmap(norm(vals))
-                        except KeyError:
-                            addingDict[val['map_color_to']] = {}
-                            addingDict[val['map_color_to']]['style'] = cmap(norm(vals))
-
-                    except KeyError:
-                        pass
-                    except IndexError:
-                        pass
-
-                #add_data for each plotting variable in the pointset.
-                for key, val in addingDict.items():
-                    try:
-                        linecollection = mpl.collections.LineCollection(val['segments'], colors=val['style'])
-                        #addingDict[key]['traj'] = self.reducePointset(data, coorddict, list(addingDict.keys())[0])
-                        addingDict[key]['data'] = linecollection
-                    except KeyError:
-                        #addingDict[key]['traj'] = self.reducePointset(data, coorddict, list(addingDict.keys())[0])
-                        pass
+                    if 'map_color_to' in val:
+                        colors = self._speed_colors(data[key])
+                        addingDict.setdefault(val['map_color_to'], {})['style'] = colors
 
+                # the same reduced pointset serves every plotted key
+                if addingDict:
                     try:
                         tra = self._reduce_pointset(data, coorddict, list(addingDict.keys())[0])
                     except (KeyError, ValueError) as e:
                         tra = None
 
-                    try:
-                        lay = addingDict[key]['layer']
-                    except KeyError:
-                        lay = None
+                #add_data for each plotting variable in the pointset.
+                for key, val in addingDict.items():
+                    if 'segments' in val and 'style' in val:
+                        linecollection = mpl.collections.LineCollection(val['segments'], colors=val['style'])
+                        #addingDict[key]['traj'] = self.reducePointset(data, coorddict, list(addingDict.keys())[0])
+                        val['data'] = linecollection
 
-                    try:
-                        nam = addingDict[key]['name']
-                    except KeyError:
-                        nam = None
+                    lay = val.get('layer')
+                    nam = val.get('name')
 
-                    try:
-                        self.plotter.add_patch(addingDict[key]['data'], addingDict[key]['patch'],
-                                         layer = lay,
-                                         name = nam,
-                                         force = True,
-                                         radius = addingDict[key]['radius'],
-                                         color = addingDict[key]['style'])
-
-                    except:
-                        self.plotter.add_data(addingDict[key]['data'],
-                                        style = addingDict[key]['style'],
-                                        layer = lay,
-                                        name = nam,
-                                        traj = tra,
-                                        linewidth = linewidth, ##ISSUE: Should do this through coorddict as well.
-                                        force = True)
+                    if 'patch' in val and 'radius' in val and 'style' in val:
+                        try:
+                            self.plotter.add_patch(val['data'], val['patch'],
+                                             layer = lay,
+                                             name = nam,
+                                             force = True,
+                                             radius = val['radius'],
+                                             color = val['style'])
+                        except ValueError:
+                            # not a patch layer: plot the positions as data
+                            pass
+                        else:
+                            continue
+
+                    self.plotter.add_data(val['data'],
+                                    style = val['style'],
+                                    layer = lay,
+                                    name = nam,
+                                    traj = tra,
+                                    linewidth = linewidth, ##ISSUE: Should do this through coorddict as well.
+                                    force = True)
         elif data is not None:
             warnings.warn("add_data_points received an unsupported type for parameter data")
             return
@@ -1740,19 +2446,22 @@ class diagnosticGUI(object):
 
         widget = widg(ax=ax, **kwargs)
         self.widgets[kwargs['label']] = widget
-        try:
-            self.widgets[kwargs['label']].on_changed(callback)
-        except AttributeError:
-            self.widgets[kwargs['label']].on_clicked(callback)
+        self._widget_axes.add(ax)
+        if callback is not None:
+            # sliders etc. report changes, buttons report clicks
+            if hasattr(widget, 'on_changed'):
+                widget.on_changed(callback)
+            else:
+                widget.on_clicked(callback)
 
 
     def add_time_from_points(self, points):
         self.traj = None
         self.points = points
         try:
-            self.times = points['t']
+            self._store_times(points['t'])
         except KeyError:
-            self.times = None
+            self._store_times(None)
         except PyDSTool_KeyError:
             pass
 
@@ -1769,87 +2478,90 @@ class diagnosticGUI(object):
         plt.close('all')
         self.masterWin = None
         self._with_times = with_times
+        self._dynamic_axes = set()
+        self.timeLines = []
+        self.timePlots = []
 
-        for figName, fig_struct in self.plotter.figs.items():
-            if figsize is not None:
-                fig_handle = plt.figure(fig_struct.fignum, figsize=figsize)
-                # fig sizing later, with fig.set_figsize_inches doesn't seem
-                # to work properly unless put in the initialization call
-            else:
-                fig_handle = plt.figure(fig_struct.fignum)
-            fig_handle.canvas.set_window_title(fig_struct.title + " : Master window")
-            if figName != 'Master' and figName != 'master':
-                continue
-            # ====== Set up master window controls
-            plt.subplots_adjust(left=0.09, right=0.98, top=0.95, bottom=0.1,
-                               wspace=0.2, hspace=0.23)
-
-            self.masterWin = fig_handle
-
-            if callbacks_on:
-                self.initialize_callbacks(self.masterWin)
-
-            # Time bar controls time lines in figures
-            # ISSUE: Not all uses of this class use time
-            if with_times:
-                sliderRange = self.times
-                slide = plt.axes([0.25, 0.02, 0.65, 0.03])
-                tMin = min(sliderRange)
-                tMax = max(sliderRange)
-                if self.t is None:
-                    self.set_time( (tMin + tMax)/2. )
-                self.widgets['timeBar'] = Slider(slide, 'Time', tMin, tMax,
-                                                valinit=self.t, color='r',
-                                                dragging=False, valfmt='%1.4f')
-
-                # button axes are in figure coords: (left, bottom, width, height)
-
-                ## +/- dt buttons
-                m_dt_Button = Button(plt.axes([0.16, 0.02, 0.017, 0.03]), '-dt')
-                self.widgets['minus_dt'] = m_dt_Button
-
-                p_dt_Button = Button(plt.axes([0.18, 0.02, 0.017, 0.03]), '+dt')
-                self.widgets['plus_dt'] = p_dt_Button
-
-            if basic_widgets:
-                # Capture point button in lower left
-                captureButton = Button(plt.axes([0.055, 0.02, 0.08, 0.03]), 'Capture Point')
-                self.widgets['capture_point'] = captureButton
-
-                # Refresh button
-                refreshButton = Button(plt.axes([0.005, 0.02, 0.045, 0.03]), 'Refresh')
-                self.widgets['refresh'] = refreshButton
-
-                # Go back to last point button
-                backButton = Button(plt.axes([0.005, 0.06, 0.045, 0.03]), 'Back')
-                self.widgets['go_back'] = backButton
-
-                # Go back to last point button
-                saveButton = Button(plt.axes([0.055, 0.06, 0.08, 0.03]), 'Save')
-                self.widgets['save'] = saveButton
-
-                # Display graphics objects hierarchy
-                showTreeButton = Button(plt.axes([0.86, 0.02, 0.12, 0.03]), 'Show Tree')
-                self.widgets['showTree'] = showTreeButton
-
-                self.widgets['capture_point'].on_clicked(self.capture_point)
-                self.widgets['refresh'].on_clicked(self.refresh)
-                self.widgets['go_back'].on_clicked(self.go_back)
-                self.widgets['save'].on_clicked(self.save)
-                self.widgets['showTree'].on_clicked(self.show_tree)
-
-            self.plotter.show(update='all', rebuild=True, force_wait=False)
-
-            # Build up each subplot, left to right, top to bottom
-            shape = fig_struct.shape
-            for i in range(shape[0]):
-                for j in range(shape[1]):
-                    ixstr = str(i+1) + str(j+1)
-                    try:
-                        subplot_struct = fig_struct.arrange[ixstr]
-                    except (KeyError, TypeError):
-                        # type error if arrange is empty list (e.g. for shape=[1,1])
-                        continue
+        # figures are drawn once, when all of them are built
+        with self.plotter._batch_updates():
+            for figName, fig_struct in self.plotter.figs.items():
+                if figsize is not None:
+                    fig_handle = plt.figure(fig_struct.fignum, figsize=figsize)
+                    # fig sizing later, with fig.set_figsize_inches doesn't seem
+                    # to work properly unless put in the initialization call
+                else:
+                    fig_handle = plt.figure(fig_struct.fignum)
+                fig_struct.window = fig_handle
+                fig_handle.canvas.set_window_title(fig_struct.title + " : Master window")
+                if figName != 'Master' and figName != 'master':
+                    continue
+                # ====== Set up master window controls
+                plt.subplots_adjust(left=0.09, right=0.98, top=0.95, bottom=0.1,
+                                   wspace=0.2, hspace=0.23)
+
+                self.masterWin = fig_handle
+
+                if callbacks_on:
+                    self.initialize_callbacks(self.masterWin)
+
+                # Time bar controls time lines in figures
+                # ISSUE: Not all uses of this class use time
+                if with_times:
+                    sliderRange = self.times
+                    slide = plt.axes([0.25, 0.02, 0.65, 0.03])
+                    tMin = min(sliderRange)
+                    tMax = max(sliderRange)
+                    if self.t is None:
+                        # (dynamic plots are initialized below)
+                        self.set_time( (tMin + tMax)/2. , update_dynamic=False)
+                    self.widgets['timeBar'] = Slider(slide, 'Time', tMin, tMax,
+                                                    valinit=self.t, color='r',
+                                                    dragging=False, valfmt='%1.4f')
+
+                    # button axes are in figure coords: (left, bottom, width, height)
+
+                    ## +/- dt buttons
+                    m_dt_Button = Button(plt.axes([0.16, 0.02, 0.017, 0.03]), '-dt')
+                    self.widgets['minus_dt'] = m_dt_Button
+
+                    p_dt_Button = Button(plt.axes([0.18, 0.02, 0.017, 0.03]), '+dt')
+                    self.widgets['plus_dt'] = p_dt_Button
+
+                if basic_widgets:
+                    # Capture point button in lower left
+                    captureButton = Button(plt.axes([0.055, 0.02, 0.08, 0.03]), 'Capture Point')
+                    self.widgets['capture_point'] = captureButton
+
+                    # Refresh button
+                    refreshButton = Button(plt.axes([0.005, 0.02, 0.045, 0.03]), 'Refresh')
+                    self.widgets['refresh'] = refreshButton
+
+                    # Go back to last point button
+                    backButton = Button(plt.axes([0.005, 0.06, 0.045, 0.03]), 'Back')
+                    self.widgets['go_back'] = backButton
+
+                    # Go back to last point button
+                    saveButton = Button(plt.axes([0.055, 0.06, 0.08, 0.03]), 'Save')
+                    self.widgets['save'] = saveButton
+
+                    # Display graphics objects hierarchy
+                    showTreeButton = Button(plt.axes([0.86, 0.02, 0.12, 0.03]), 'Show Tree')
+                    self.widgets['showTree'] = showTreeButton
+
+                    self.widgets['capture_point'].on_clicked(self.capture_point)
+                    self.widgets['refresh'].on_clicked(self.refresh)
+                    self.widgets['go_back'].on_clicked(self.go_back)
+                    self.widgets['save'].on_clicked(self.save)
+                    self.widgets['showTree'].on_clicked(self.show_tree)
+
+                self._widget_axes = set(w.ax for w in self.widgets.values())
+                self.plotter.show(update='all', rebuild=True, force_wait=False)
+
+                # Visit each arranged subplot, left to right, top to bottom
+                # (arrange is an empty list for e.g. shape=[1,1])
+                arrange = fig_struct.arrange or {}
+                for ixstr in sorted(arrange, key=_subplot_index):
+                    subplot_struct = arrange[ixstr]
                     layer_info = subplot_struct['layers']
                     if not isinstance(layer_info, list):
                         if layer_info == '*':
@@ -1863,18 +2575,26 @@ class diagnosticGUI(object):
                     for layName in layer_info:
                         if layName in self.dynamicPlotFns:
                             self.dynamicPlots[layName] = ax
+                            self._dynamic_axes.add(ax)
                             # initialize the layer's dynamic stuff
                             self.dynamicPlotFns[layName](self.t)
-                    if with_times:
-                        # add vertical time line in all time plots
-                        # (provide option for user to specify as time or t)
-                        if subplot_struct['axes_vars'][0].lower() in ["time", 't']:
-                            self.timeLines.append(ax.axvline(x=self.t, color='r',
-                                                         linewidth=3, linestyle='--'))
-                            self.timePlots.extend(layer_info)
-
-        if [isinstance(fig_struct['arrange'][pos]['axes_obj'], Axes3D) for pos in fig_struct['arrange'].keys()]:
-            print("3D Axes can be rotated by clicking and dragging.")
+                    # add vertical time line in all time plots
+                    # (provide option for user to specify as time or t)
+                    if with_times and \
+                       subplot_struct['axes_vars'][0].lower() in ('time', 't'):
+                        line = ax.axvline(x=self.t, color='r',
+                                          linewidth=3, linestyle='--')
+                        # blitted by set_time, see Plotter._blit_dynamic
+                        line.set_animated(getattr(ax.figure.canvas,
+                                                   'supports_blit', False))
+                        self.timeLines.append(line)
+                        self.timePlots.extend(layer_info)
+
+        # (not any(): the star import from PyDSTool shadows the builtin)
+        for subplot_struct in (fig_struct.arrange or {}).values():
+            if isinstance(subplot_struct['axes_obj'], Axes3D):
+                print("3D Axes can be rotated by clicking and dragging.")
+                break
 
         # Activate button & slider callbacks
         #self.widgets['capture_point'].on_clicked(self.capture_point)
@@ -1882,14 +2602,18 @@ class diagnosticGUI(object):
         #self.widgets['go_back'].on_clicked(self.go_back)
         #self.widgets['save'].on_clicked(self.save)
         if with_times:
-            self.widgets['timeBar'].on_changed(self.update_plots)
+            # only the latest of a burst of time bar changes updates the
+            # plots, once the timer runs out
+            self._time_bar_timer = self.masterWin.canvas.new_timer(interval=50)
+            self._time_bar_timer.single_shot = True
+            self._time_bar_timer.add_callback(self._time_bar_timeout)
+            self.widgets['timeBar'].on_changed(self._on_time_bar_changed)
             self.widgets['minus_dt'].on_clicked(self.minus_dt)
             self.widgets['plus_dt'].on_clicked(self.plus_dt)
 
         # Activate general mouse click callbacks
         evMouseDown = fig_handle.canvas.mpl_connect('button_press_event', self.mouse_down)
         evMouseUp = fig_handle.canvas.mpl_connect('button_release_event', self.mouse_up)
-        evMouseMove = fig_handle.canvas.mpl_connect('motion_notify_event', self.mouse_move)
         evKeyOn = fig_handle.canvas.mpl_connect('key_press_event', self.modifier_key_on)
         evKeyOff = fig_handle.canvas.mpl_connect('key_release_event', self.modifier_key_off)
 
@@ -1907,11 +2631,14 @@ class diagnosticGUI(object):
         else:
             layer_struct.data = {}
 
-    def clear_axes(self, subplot, figure=None):
+    def clear_axes(self, subplot, figure=None, redraw=False):
         """
         Clears lines and points in sub-plot axes (given as an axis
         object or sub-plot string name) without removing
         other items such as title, labels.
+
+        Nothing is drawn unless redraw is True, so that several calls
+        can be followed by a single redraw.
         """
         fig_struct, figure = self.plotter._resolve_fig(figure)
         arrPlots = fig_struct.arrange
@@ -1936,7 +2663,11 @@ class diagnosticGUI(object):
 
         # ax.clear correctly removes some of the plots that persist
         # with ax.lines = [], but it also clears the axes labels
-        ax.lines = []
+        # (and ax.lines can no longer be assigned to)
+        for line in list(ax.lines):
+            line.remove()
+        if redraw:
+            ax.figure.canvas.draw_idle()
         #ax.clear()
 ##        ax.set_title(subplot_struct['name'])
 ##        axes_vars = subplot_struct['axes_vars']
@@ -1950,10 +2681,22 @@ class diagnosticGUI(object):
     def mouse_down(self, ev):
         self._mouseUp = False
         #print("mouse_down", self._mouseUp)
+        # motion only matters to detect a drag, so mouse_move is not
+        # called for plain hovering
+        self._disconnect_move()
+        self._move_cid = (ev.canvas,
+                          ev.canvas.mpl_connect('motion_notify_event', self.mouse_move))
+
+    def _disconnect_move(self):
+        if self._move_cid is not None:
+            canvas, cid = self._move_cid
+            canvas.mpl_disconnect(cid)
+            self._move_cid = None
 
     def mouse_up(self, ev):
         # NOTE: zoom dragging will not get completed before this callback
         # so trying to refresh as a result of zoom here will fail
+        self._disconnect_move()
         self._mouseUp = True
         #print("mouse_up", self._mouseUp)
         # if in a time-based sub-plot and not dragging
@@ -1961,13 +2704,12 @@ class diagnosticGUI(object):
         if not self._mouseDrag:
             do_get = True and self._with_times
             # check widget axes
-            for w in self.widgets.values():
-                if ev.inaxes == w.ax:
-                    do_get = False
+            if ev.inaxes in self._widget_axes:
+                do_get = False
         if do_get:
             # resolve whether up happens in time-based plot
             # or a dynamic plot
-            if ev.inaxes in self.dynamicPlots.values():
+            if ev.inaxes in self._dynamic_axes:
                 self.get_dynamic_point(ev)
             else:
                 self.get_point(ev)
@@ -2091,17 +2833,19 @@ class diagnosticGUI(object):
             if self.t is not None:
                 pt_dict = {'t': self.t, 'ix': self.ix}
 
+                # a layer shown in several sub-plots is only sampled once
+                sampled = set()
                 for subplot, subplot_struct in fig_struct.arrange.items():
-                    layer_info = subplot_struct['layers']
-
-                    for layName in layer_info:
-                        #yvar = fig_struct.layers[layName].axes_vars[1]
+                    for layName in subplot_struct['layers']:
                         # ignore dynamic sub-plots such as phase plane, which don't show
                         # time-varying quantities that can be sampled this way
-                        if layName in self.timePlots:
-                            for data_name, traj in fig_struct.layers[layName].trajs.items():
-                                if fig_struct.layers[layName].kind == 'data':
-                                    pt_dict[data_name] = traj(self.t)['y'] #ISSUE: Why is it hardwired to select y coord?
+                        if layName in sampled or layName not in self.timePlots:
+                            continue
+                        sampled.add(layName)
+                        if fig_struct.layers[layName].kind != 'data':
+                            continue
+                        for data_name, traj in self.plotter._resolve_trajs(figName, layName).items():
+                            pt_dict[data_name] = traj(self.t)['y'] #ISSUE: Why is it hardwired to select y coord?
 
             elif self.selected_object is not None:
                 pt_dict = {}
@@ -2117,22 +2861,15 @@ class diagnosticGUI(object):
                 print("No selected object or points at time-step to capture")
                 return
 
-            print("figName: ")
-            print(figName)
-            print("pt_dict: ")
-            print(pt_dict)
-            print(type(pt_dict))
-
             if self.t is not None:
-                print("Point(pt_dict): ")
-                print(Point(pt_dict))
-                type(Point(pt_dict))
-                print("...")
-                pts_dict.update({figName: Point(pt_dict)})
-
+                pt = Point(pt_dict)
             else:
-                print("...")
-                pts_dict.update({figName: pt_dict})
+                pt = pt_dict
+            pts_dict[figName] = pt
+
+            if self.verbose >= 2:
+                print("figName: %s" % figName)
+                print(pt)
 
         if self.verbose >= 1 and self.t is not None:
             # print point information to stdout console
@@ -2146,52 +2883,113 @@ class diagnosticGUI(object):
         self.capturedPts = pts_dict
 
 
-    def set_time(self, time):
+    def set_time(self, time, update_dynamic=True):
         """
         Find nearest time in data set to selected value, and set attribute t
         accordingly. Also updates time bar widget if it has been
-        created.
+        created, and (unless update_dynamic is False) the dynamic plots,
+        if the time changed.
+        """
+        # time lines and dynamic layers are redrawn together
+        with self.plotter._batch_updates():
+            if self._move_time(time) and update_dynamic:
+                self.plotter.update_dynamic(self.t, self.dynamicPlotFns)
+
+    def _move_time(self, time):
+        """
+        Internal part of set_time: sets t and ix, and moves the time lines
+        and time bar. Returns whether the time changed.
         """
         if time is None:
             # do nothing at all on mouse drag event in window
-            return
-        ix = int(np.argmin(abs(self.times - time)))
+            return False
+        if self._times_sorted:
+            ix = _nearest_index(self.times, time)
+        else:
+            # binary search needs increasing times
+            ix = int(np.argmin(abs(self.times - time)))
         if ix == self.ix:
             # nothing to do
-            return
+            return False
         self.t = self.times[ix]
         self._last_ix = self.ix
         self.ix = ix
-        do_draw = False
+        line_figs = set()
         for line in self.timeLines:
-            line.set_data(([time, time], [0,1]))
-            do_draw = True
+            # y spans the axes (axvline's default), only x ever changes
+            line.set_xdata((time, time))
+            if line.figure is not None:
+                # (not removed, e.g. by clear_axes)
+                line_figs.add(line.figure)
+        # only the time lines changed: blit them over the cached
+        # backgrounds rather than redrawing whole figures
+        for figName, fig_struct in self.plotter.figs.items():
+            f = self.plotter._mpl_fig(fig_struct)
+            if f in line_figs:
+                self.plotter._blit_dynamic(figName)
+                line_figs.discard(f)
+        for f in line_figs:
+            f.canvas.draw_idle()
         try:
-            if self.widgets['timeBar'].val != time:
-                self.widgets['timeBar'].set_val(time)
+            time_bar = self.widgets['timeBar']
         except KeyError:
             # timeBar not yet created
             pass
         else:
-            do_draw = True
-        if do_draw:
-            plt.draw()
+            if time_bar.val != time:
+                # the slider schedules its own idle redraw; its callback
+                # ignores this change (see _on_time_bar_changed)
+                self._in_set_time = True
+                try:
+                    time_bar.set_val(time)
+                finally:
+                    self._in_set_time = False
+        return True
 
     def go_back(self, ev):
         if self._last_ix is not None:
             self.update_plots(self.times[self._last_ix])
 
     def update_plots(self, new_time):
-        self.set_time(new_time)
-        self.plotter.update_dynamic(self.t, self.dynamicPlotFns)
+        # time lines and dynamic layers are redrawn together
+        with self.plotter._batch_updates():
+            self.set_time(new_time, update_dynamic=False)
+            self.plotter.update_dynamic(self.t, self.dynamicPlotFns)
+
+    def _on_time_bar_changed(self, val):
+        """
+        timeBar callback: (re)start the timer rather than updating the
+        plots for every change.
+        """
+        if self._in_set_time:
+            # echo of set_time moving the bar, which updates the dynamic
+            # plots itself (or was asked not to)
+            return
+        self._pending_t = val
+        timer = self._time_bar_timer
+        if timer is None or type(timer) is TimerBase:
+            # no event loop to run the timer (e.g. non-interactive backend)
+            self._time_bar_timeout()
+            return
+        timer.stop()
+        timer.start()
+
+    def _time_bar_timeout(self):
+        """
+        Timer callback: update the plots to the latest time bar value.
+        """
+        if self._pending_t is not None:
+            t, self._pending_t = self._pending_t, None
+            self.update_plots(t)
 
     def refresh(self, ev):
         """
         For refresh button, e.g. use after zoom in dynamic plot
         """
         hard_reset = self._key_mod == 'shift'
-        self.plotter.update_dynamic(self.t, self.dynamicPlotFns,
-                                   hard_reset)
+        with self.plotter._batch_updates():
+            self.plotter.update_dynamic(self.t, self.dynamicPlotFns,
+                                       hard_reset)
 
     def save(self, ev):
         """
@@ -2199,7 +2997,7 @@ class diagnosticGUI(object):
         in working directory or dm directory if provided.
         """
         fig_struct, fig_name = self.plotter._resolve_fig(self.plotter.currFig)
-        f = plt.figure(fig_struct.fignum)
+        f = self.plotter._figure_window(fig_struct)
 
         if self.plotter.dm is not None:
             dirpath = self.plotter.dm._dirpath
@@ -2430,11 +3228,11 @@ class diagnosticGUI(object):
             self.mouse_wait_state_owner = 'box'
         elif k == ' ':
             print("Output of user function at clicked mouse point")
-            self.mouse_cid = self.fig.canvas.mpl_connect('button_release_event', self.mouse_event_user_function)
+            self._connect_mouse(self.mouse_event_user_function)
             self.mouse_wait_state_owner = 'user_func'
         elif k == 's':
             print("Snap clicked mouse point to closest point on trajectory")
-            self.mouse_cid = self.fig.canvas.mpl_connect('button_release_event', self.mouse_event_snap)
+            self._connect_mouse(self.mouse_event_snap)
             self.mouse_wait_state_owner = 'snap'
         elif k == dom_key:
             if self.selected_object_temphandle is not None:
@@ -2449,6 +3247,17 @@ class diagnosticGUI(object):
                 self.current_domain_handler.event('key')
                 self.mouse_wait_state_owner = 'domain'
 
+    def _connect_mouse(self, callback):
+        """
+        Internal utility to connect callback to the next mouse button
+        release, replacing any callback still waiting for one (otherwise
+        repeated key presses would pile up connections).
+        """
+        if self.mouse_cid is not None:
+            self.fig.canvas.mpl_disconnect(self.mouse_cid)
+        self.mouse_cid = self.fig.canvas.mpl_connect('button_release_event',
+                                                     callback)
+
     def key_off(self, ev):
         # TEMP
         #pass
@@ -2495,7 +3304,7 @@ class diagnosticGUI(object):
         for layer_name in fig_struct['layers'].keys():
             try:
                 #trajs.append(list(fig_struct['layers'][layer_name]['trajs'].values())[0])
-                trajs += list(fig_struct['layers'][layer_name]['trajs'].values())
+                trajs += list(self.plotter._resolve_trajs(figs, layer_name).values())
             except KeyError:
                 pass
 
@@ -2503,21 +3312,36 @@ class diagnosticGUI(object):
             print("No trajectory defined")
             return
         print("\nClick: (%.4f, %.4f)" %(ev.xdata, ev.ydata))
-        # have to guess phase, use widest tolerance
 
         found_pts = []
         #print('trajs', trajs)
+        eps = 200
+        # trajectories are rebuilt (new objects) when their data change,
+        # so trees of any not found here are out of date
+        snap_trees = {}
         for traj in trajs:
-            xname = traj.coordnames[0]
-            yname = traj.coordnames[1]
-
-            eps = 0.1
-            eps = 200
-            try:
-                found_pt = pp.find_pt_nophase_2D(traj.sample(), pp.Point2D(ev.xdata, ev.ydata, xname= xname, yname= yname), eps=eps)
-                found_pts.append(found_pt)
-            except ValueError:
-                pass
+            xname, yname = traj.coordnames[:2]
+            entry = self._snap_trees.get(id(traj))
+            if entry is None or entry[0] is not traj:
+                pts = traj.sample()
+                xys = np.column_stack((pts[xname], pts[yname]))
+                # the tree can't hold non-finite coordinates: search those
+                # trajectories by phase instead
+                tree = cKDTree(xys) if np.isfinite(xys).all() else None
+                entry = (traj, pts, tree)
+            snap_trees[id(traj)] = entry
+            pts, tree = entry[1:]
+            if tree is None:
+                try:
+                    found_pt = pp.find_pt_nophase_2D(pts, pp.Point2D(ev.xdata, ev.ydata, xname= xname, yname= yname), eps=eps)
+                    found_pts.append(found_pt)
+                except ValueError:
+                    pass
+                continue
+            d, ix = tree.query((ev.xdata, ev.ydata))
+            if d < eps:
+                found_pts.append((int(ix), d, pts[int(ix)]))
+        self._snap_trees = snap_trees
 
         if found_pts == []:
             print("No nearby point found. Try again")
@@ -2539,7 +3363,7 @@ class diagnosticGUI(object):
         if self.selected_object_temphandle is not None:
             self.selected_object_temphandle.remove()
         self.selected_object_temphandle = self.RS_lines[ev.inaxes].ax.plot(x_snap, y_snap, 'go')[0]
-        self.fig.canvas.draw()
+        self.fig.canvas.draw_idle()
         print("Last output = (index, distance, point)")
         print("            = (%i, %.3f, (%.3f, %.3f))" % (data[0], data[1],
                                                           x_snap, y_snap))
@@ -2560,7 +3384,7 @@ class diagnosticGUI(object):
         if self.selected_object_temphandle is not None:
             self.selected_object_temphandle.remove()
         self.selected_object_temphandle = ev.inaxes.plot(ev.xdata, ev.ydata, 'go')[0]
-        self.fig.canvas.draw()
+        self.fig.canvas.draw_idle()
         self.fig.canvas.mpl_disconnect(self.mouse_cid)
         self.mouse_wait_state_owner = None
 
@@ -3019,10 +3843,10 @@ class line_GUI(shape_GUI):
 
         shape_GUI.__init__(self, gui, pt1, pt2, layer='gx_objects', subplot=subplot, name= name)
 
-        self.length = np.linalg.norm((self.dx, self.dy))
+        self.length = hypot(self.dx, self.dy)
         # angle relative to horizontal, in radians
         self.ang = atan2(self.dy,self.dx)
-        self.ang_deg = 180*self.ang/pi
+        self.ang_deg = degrees(self.ang)
 
         # slope and y intercept
         self.m = (self.y2 - self.y1)/(self.x2 - self.x1)
@@ -3049,13 +3873,18 @@ class line_GUI(shape_GUI):
         """
         Calculate absolute (x,y) position of distance dist from (x1,y1) along line
         """
-        return self.fraction_to_pos(self, dist/self.length)
+        return self.fraction_to_pos(dist/self.length)
 
 
     def fraction_to_pos(self, fraction):
         """
         Calculate absolute (x,y) position of fractional distance (0-1) from (x1,y1) along line
+
+        fraction may also be an array of fractions, to sample many positions
+        in one call: the result is then a 2 x len(fraction) array of x and y
+        values.
         """
+        fraction = np.asarray(fraction, dtype=float)
         return np.array([self.x1+fraction*self.dx, self.y1+fraction*self.dy])
 
     def order_points(self, x1, x2, y1, y2):
@@ -3098,6 +3927,9 @@ class tracker_textconsole(tracker_GUI):
         self.figs = {}
         self.sim = None
         self.calc_context = None
+        # (id(workspace), attribute) -> (workspace names when indexed,
+        # names of public objects having the attribute)
+        self._attr_index = {}
 
     def __call__(self, calc_context, fignum, attribute_name):
         self.sim = calc_context.sim
@@ -3112,27 +3944,45 @@ class tracker_textconsole(tracker_GUI):
             self.figs[fignum] = args(figure=fig, tracked=[attribute_name])
         self.sim.tracked_objects.append(self)
 
+    def _tracked_names(self, wspace, attribute_name):
+        """
+        Internal utility to list the names of public workspace objects
+        having the attribute. Only re-indexed when the workspace's names
+        change, not on every refresh.
+        """
+        names = tuple(wspace.__dict__)
+        key = (id(wspace), attribute_name)
+        indexed = self._attr_index.get(key)
+        if indexed is None or indexed[0] != names:
+            # (names starting with '_' are internal, ignore)
+            indexed = self._attr_index[key] = (names,
+                     [obj_name for obj_name, obj in wspace.__dict__.items()
+                      if obj_name[0] != '_' and hasattr(obj, attribute_name)])
+        return indexed[1]
+
     def show(self):
         for fignum, figdata in self.figs.items():
             fig = plt.figure(fignum)
-            ax = plt.axes([0., 0., 1., 1.], frameon=False, xticks=[],yticks=[])
+            if 'ax' not in figdata:
+                # plt.axes would add a new axes on every refresh
+                figdata.ax = plt.axes([0., 0., 1., 1.], frameon=False, xticks=[],yticks=[])
+            ax = figdata.ax
             #figdata.figure.clf()
             ax.cla()
             ax.set_frame_on(False)
             ax.get_xaxis().set_visible(False)
             ax.get_yaxis().set_visible(False)
             wspace = self.calc_context.workspace
+            i = 0
             for tracked_attr in figdata.tracked:
-                for i, (obj_name, obj) in enumerate(wspace.__dict__.items()):
-                    if obj_name[0] == '_':
-                        # internal name, ignore
+                for obj_name in self._tracked_names(wspace, tracked_attr):
+                    # the object may have been replaced (or removed) under
+                    # the same name since the index was built
+                    data = getattr(wspace.__dict__.get(obj_name), tracked_attr, None)
+                    if data is None:
                         continue
-                    try:
-                        data = getattr(obj, tracked_attr)
-                    except Exception as e:
-                        print("No attribute: '%s' in object in workspace '%s'" % (tracked_attr, wspace._name))
-                        raise
-                    plt.text(0.05, 0.05+i*0.04, '%s: %s = %.4g' % (obj_name, tracked_attr, data))
+                    ax.text(0.05, 0.05+i*0.04, '%s: %s = %.4g' % (obj_name, tracked_attr, data))
+                    i += 1
             plt.title('%s measures of %s (workspace: %s)'%(self.calc_context.sim.name, tracked_attr,
                                                            _escape_underscore(self.calc_context.workspace._name)))
             fig.canvas.set_window_title("Fig %i, Workspace %s" % (fignum, self.calc_context.workspace._name))
@@ -3167,8 +4017,9 @@ class tracker_plotter(tracker_GUI):
             fig = plt.figure(fignum)
             ax = plt.gca()
             #figdata.figure.clf()
-            if self.clear_on_refresh:
-                ax.cla()
+            # with clear_on_refresh, each tracked line is plotted once and
+            # only its data replaced afterwards, rather than clearing the
+            # axes (and its title and legend) and re-plotting
             wspace = self.calc_context.workspace
             for tracked in figdata.tracked:
                 try:
@@ -3181,12 +4032,19 @@ class tracker_plotter(tracker_GUI):
                 except Exception as e:
                     print("Failed to evaluate: '%s' in workspace '%s'" % (tracked.ystr, wspace._name))
                     raise
-                if self.clear_on_refresh or not self.ever_shown:
+                if self.clear_on_refresh and 'line' in tracked and \
+                   tracked.line.axes is ax:
+                    tracked.line.set_data(np.atleast_1d(xdata),
+                                          np.atleast_1d(ydata))
+                elif self.clear_on_refresh or not self.ever_shown:
                     # only show labels once
-                    ax.plot(xdata, ydata,
+                    tracked.line, = ax.plot(xdata, ydata,
                             tracked.style, label=_escape_underscore(tracked.ystr))
                 else:
                     ax.plot(xdata, ydata, tracked.style)
+            if self.clear_on_refresh:
+                ax.relim()
+                ax.autoscale_view()
             if not self.ever_shown:
                 plt.legend()
                 plt.title('%s measures vs %s (workspace: %s)'%(self.calc_context.sim.name, tracked.xstr,
@@ -3271,7 +4129,9 @@ def _escape_underscore(text):
     """
     Internal utility to escape any TeX-related underscore ('_') characters in mpl strings
     """
-    return text.replace('_', '\_')
+    # (str.replace beats a str.translate table here: the mapping to a
+    # two-character string takes translate's slow path)
+    return text.replace('_', r'\_')
 
 # ---------------------------------------------------------
 
@@ -3284,5 +4144,6 @@ plotter = Plotter()
 
 gui = diagnosticGUI(plotter)
 
-# Made an attribute of diagnosticGUI class
-#tracker = tracker_manager()
+# Made an attribute of diagnosticGUI class (the module-level name is kept
+# for scripts doing "from fovea.graphics import tracker")
+tracker = gui.tracker
@@ -10,16 +10,21 @@ plotter.coords=('x','y')
 
 a, b = force_line_to_extent(Point2D((0.25,0)), Point2D((0.5,0.1)),
                             plotter.domain, plotter.coords)
+# slope 0.4 through (0.25, 0): leaves by the left and right sides
+assert np.allclose(np.array((a, b)), [(-1, -0.5), (1, 0.3)])
 plt.plot(np.array((a, b)).T[0], np.array((a, b)).T[1], 'g')
 
 cc, dd = Point2D((3,-2.5)), Point2D((-5.1,1.8))
 plt.plot(np.array((cc, dd)).T[0], np.array((cc, dd)).T[1], 'b:')
 c, d = force_line_to_extent(Point2D((3,-2.5)), Point2D((-5.1,1.8)),
                             plotter.domain, plotter.coords)
+# ordered from the side of the first point
+assert np.allclose(np.array((c, d)), [(1, -2.5+2*4.3/8.1), (-1, -2.5+4*4.3/8.1)])
 plt.plot(np.array((c, d)).T[0], np.array((c, d)).T[1], 'r')
 
 e, f = force_line_to_extent(np.array((0.25,0)), np.array((1.5,0.1)),
                             plotter.domain, plotter.coords)
+assert np.allclose(np.array((e, f)), [(-1, -0.1), (1, 0.06)])
 plt.plot(np.array((e, f)).T[0], np.array((e, f)).T[1], 'g')
 
 
@@ -0,0 +1,49 @@
+"""
+Each change of time updates the dynamic plots exactly once, including when
+set_time moves the time bar (whose callback must not update them again).
+"""
+import numpy as np
+from matplotlib import pyplot as plt
+from matplotlib.widgets import Slider
+
+import fovea.graphics as gx
+
+plotter = gx.Plotter()
+gui = gx.diagnosticGUI(plotter)
+gui.add_time_from_points({'t': np.linspace(0, 10, 21)})
+gui.ix = 0
+gui.t = 0.
+
+# time bar wired up as in build_plotter (no timer: changes apply at once)
+fig = plt.figure()
+gui.widgets['timeBar'] = Slider(plt.axes([0.25, 0.02, 0.65, 0.03]), 'Time',
+                                0, 10, valinit=0)
+gui.widgets['timeBar'].on_changed(gui._on_time_bar_changed)
+
+calls = []
+plotter.update_dynamic = lambda time, fns, hard_reset=False: calls.append(time)
+
+gui.update_plots(3.0)
+assert calls == [3.0], calls
+
+del calls[:]
+gui.set_time(5.0)
+assert calls == [5.0], calls
+
+# unchanged time: nothing to update
+del calls[:]
+gui.set_time(5.1)
+assert calls == [], calls
+
+# user moving the time bar
+del calls[:]
+gui.widgets['timeBar'].set_val(7.0)
+assert calls == [7.0], calls
+assert gui.t == 7.0
+
+del calls[:]
+gui.set_time(2.0, update_dynamic=False)
+assert calls == [], calls
+assert gui.widgets['timeBar'].val == 2.0
+
+print("time updates ok")